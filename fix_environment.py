@@ -4,28 +4,32 @@
 import os
 import sys
 
+def _safe_threads():
+    """Pick a BLAS/OpenMP thread count that is fast but leaves headroom."""
+    return str(min(8, max(1, (os.cpu_count() or 2) // 2)))
+
+
 def set_safe_environment():
     """Set environment variables to prevent segfaults and crashes."""
     # Disable Metal acceleration on macOS
     os.environ['GGML_METAL'] = '0'
     os.environ['GGML_METAL_ENABLE'] = '0'
-    
+
     # Disable CUDA
     os.environ['CUDA_VISIBLE_DEVICES'] = ''
-    
-    # Disable OpenMP to prevent threading issues
-    os.environ['OMP_NUM_THREADS'] = '1'
-    
-    # Disable MKL threading
-    os.environ['MKL_NUM_THREADS'] = '1'
-    
-    # Disable multiprocessing for sentence-transformers
+
+    # Single-threading everything cripples BLAS GEMM, which is the hot path
+    # of the embedding model. Use a tuned count by default; RAG_SAFE_MODE=1
+    # restores the fully single-threaded setup for debugging crashes.
+    threads = '1' if os.environ.get('RAG_SAFE_MODE') == '1' else _safe_threads()
+    os.environ['OMP_NUM_THREADS'] = threads
+    os.environ['MKL_NUM_THREADS'] = threads
+    os.environ['NUMEXPR_NUM_THREADS'] = threads
+    os.environ['VECLIB_MAXIMUM_THREADS'] = threads
+
+    # Disable multiprocessing for sentence-transformers (fork-safety, not perf)
     os.environ['TOKENIZERS_PARALLELISM'] = 'false'
-    
-    # Force single thread for everything
-    os.environ['NUMEXPR_NUM_THREADS'] = '1'
-    os.environ['VECLIB_MAXIMUM_THREADS'] = '1'
-    
+
     print("Environment variables set for maximum stability:")
     for key in ['GGML_METAL', 'CUDA_VISIBLE_DEVICES', 'OMP_NUM_THREADS', 
                 'MKL_NUM_THREADS', 'TOKENIZERS_PARALLELISM']:
@@ -10,6 +10,8 @@ import subprocess
 import platform
 from pathlib import Path
 
+import platform_info
+
 
 def run_command(command, cwd=None, check=True):
     """Run a command and handle errors."""
@@ -49,29 +51,16 @@ def check_system_requirements():
     if not check_python_version():
         return False
     
-    # Check available memory (rough estimate)
+    # Check available memory (cached probe, refresh with --rescan-platform)
     try:
-        if platform.system() == "Darwin":  # macOS
-            result = subprocess.run(["sysctl", "hw.memsize"], capture_output=True, text=True)
-            if result.returncode == 0:
-                mem_bytes = int(result.stdout.split()[1])
-                mem_gb = mem_bytes / (1024**3)
-                print(f"Available memory: {mem_gb:.1f} GB")
-                if mem_gb < 8:
-                    print("Warning: Less than 8GB RAM detected. Performance may be limited.")
-        elif platform.system() == "Linux":
-            result = subprocess.run(["free", "-b"], capture_output=True, text=True)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                mem_line = lines[1].split()
-                mem_bytes = int(mem_line[1])
-                mem_gb = mem_bytes / (1024**3)
-                print(f"Available memory: {mem_gb:.1f} GB")
-                if mem_gb < 8:
-                    print("Warning: Less than 8GB RAM detected. Performance may be limited.")
+        info = platform_info.detect(refresh='--rescan-platform' in sys.argv)
+        if info['mem_gb'] > 0:
+            print(f"Available memory: {info['mem_gb']:.1f} GB")
+            if info['mem_gb'] < 8:
+                print("Warning: Less than 8GB RAM detected. Performance may be limited.")
     except Exception:
         print("Could not check memory, proceeding anyway...")
-    
+
     return True
 
 
@@ -102,17 +91,61 @@ def get_pip_command():
         return "venv/bin/pip"
 
 
+PIP_CACHE_DIR = Path.home() / ".cache" / "rag-persona" / "pip"
+WHEEL_DIR = Path(".wheels")
+
+
+def parse_requirements():
+    """Parse requirements.txt into a list of requirement strings."""
+    requirements = []
+    for line in Path("requirements.txt").read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            requirements.append(line)
+    return requirements
+
+
+def prefetch_wheels(pip_cmd):
+    """Download wheels for all top-level requirements in parallel."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    WHEEL_DIR.mkdir(exist_ok=True)
+
+    def fetch(requirement):
+        return run_command(
+            f"{pip_cmd} download --no-deps --quiet --cache-dir '{PIP_CACHE_DIR}' "
+            f"--dest '{WHEEL_DIR}' '{requirement}'",
+            check=False
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(fetch, parse_requirements()))
+
+    print(f"Prefetched wheels for {sum(results)}/{len(results)} requirements")
+
+
 def install_dependencies():
     """Install Python dependencies."""
     pip_cmd = get_pip_command()
-    
+
     print("Upgrading pip...")
     if not run_command(f"{pip_cmd} install --upgrade pip"):
         print("Warning: Could not upgrade pip")
-    
+
+    # N parallel fetches up front, then one resolver pass that reuses the
+    # local wheel store (.wheels/ persists and speeds up the next run too).
+    # Transitive deps not covered by --no-deps still resolve from the index.
+    print("Prefetching wheels in parallel...")
+    try:
+        prefetch_wheels(pip_cmd)
+    except Exception as e:
+        print(f"Wheel prefetch skipped: {e}")
+
     print("Installing dependencies...")
-    success = run_command(f"{pip_cmd} install -r requirements.txt")
-    
+    success = run_command(
+        f"{pip_cmd} install --cache-dir '{PIP_CACHE_DIR}' --find-links '{WHEEL_DIR}' -r requirements.txt"
+    )
+
     if success:
         print("Dependencies installed ✓")
         return True
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Cached platform detection for Local RAG Assistant setup scripts."""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+CACHE_PATH = Path.home() / ".cache" / "rag-persona" / "platform.json"
+
+
+def normalize_arch(machine):
+    """Map platform.machine() spellings onto canonical architecture names."""
+    machine = machine.lower()
+    if machine in ('x86_64', 'amd64'):
+        return 'x86_64'
+    if machine in ('arm64', 'aarch64'):
+        return 'arm64'
+    return machine
+
+
+def _probe_mem_gb(system):
+    """Probe total system memory in GB (0.0 if undetectable)."""
+    try:
+        if system == 'darwin':
+            result = subprocess.run(['sysctl', 'hw.memsize'], capture_output=True, text=True)
+            if result.returncode == 0:
+                return int(result.stdout.split()[1]) / (1024 ** 3)
+        elif system == 'linux':
+            result = subprocess.run(['free', '-b'], capture_output=True, text=True)
+            if result.returncode == 0:
+                mem_line = result.stdout.strip().split('\n')[1].split()
+                return int(mem_line[1]) / (1024 ** 3)
+    except Exception:
+        pass
+    return 0.0
+
+
+def _probe():
+    """Run all platform probes once and return the detection dict."""
+    system = platform.system().lower()
+    arch = normalize_arch(platform.machine())
+
+    return {
+        'system': system,
+        'arch': arch,
+        'py_tag': f"cp{sys.version_info.major}{sys.version_info.minor}",
+        'mem_gb': round(_probe_mem_gb(system), 1),
+        'has_cuda': shutil.which('nvidia-smi') is not None,
+        'has_metal': system == 'darwin' and arch == 'arm64',
+    }
+
+
+def detect(refresh=False):
+    """
+    Get platform information, cached across runs.
+
+    The probes (sysctl/free subprocesses, CUDA lookup) are stable per
+    machine, so the result is persisted to ~/.cache/rag-persona and
+    reloaded on subsequent calls.
+
+    Args:
+        refresh: Force a re-probe even if a cached result exists.
+
+    Returns:
+        Dictionary with system, arch, py_tag, mem_gb, has_cuda, has_metal.
+    """
+    if not refresh and CACHE_PATH.exists():
+        try:
+            return json.loads(CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            pass
+
+    info = _probe()
+
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(CACHE_PATH.parent), suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(info, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        pass
+
+    return info
+
+
+if __name__ == '__main__':
+    print(json.dumps(detect(refresh='--rescan-platform' in sys.argv), indent=2))
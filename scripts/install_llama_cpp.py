@@ -7,67 +7,137 @@ This handles the complex compilation process separately.
 import platform
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import platform_info
+
+PIP_CACHE_DIR = Path.home() / ".cache" / "rag-persona" / "pip-wheels"
+
+_WHEEL_BASE = "https://github.com/abetlen/llama-cpp-python/releases/download/v0.3.16"
+
+# (system, arch, py_tag) -> (wheel URL, sha256 pin or None).
+# Pins enable pip --require-hashes; fill them in as wheels are verified.
+WHEELS = {
+    ('darwin', 'arm64', 'cp311'): (
+        f"{_WHEEL_BASE}/llama_cpp_python-0.3.16-cp311-cp311-macosx_11_0_arm64.whl", None),
+    ('darwin', 'x86_64', 'cp311'): (
+        f"{_WHEEL_BASE}/llama_cpp_python-0.3.16-cp311-cp311-macosx_10_9_x86_64.whl", None),
+    ('linux', 'x86_64', 'cp311'): (
+        f"{_WHEEL_BASE}/llama_cpp_python-0.3.16-cp311-cp311-linux_x86_64.whl", None),
+    ('windows', 'x86_64', 'cp311'): (
+        f"{_WHEEL_BASE}/llama_cpp_python-0.3.16-cp311-cp311-win_amd64.whl", None),
+}
+
+
+def get_platform_wheel():
+    """Get the pinned (url, sha256) wheel entry for this platform, or None."""
+    info = platform_info.detect()
+    return WHEELS.get((info['system'], info['arch'], info['py_tag']))
+
+
+def install_pinned_wheel(url, sha256=None):
+    """
+    Install a wheel URL via pip, using the shared wheel cache.
+
+    When a sha256 pin is available, installs through a generated
+    requirements snippet with --require-hashes so the download is verified.
+    """
+    base_cmd = [sys.executable, '-m', 'pip', 'install', '--cache-dir', str(PIP_CACHE_DIR)]
+
+    if sha256 is None:
+        subprocess.run(base_cmd + [url], check=True, capture_output=True, text=True)
+        return
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write(f"llama-cpp-python @ {url} --hash=sha256:{sha256}\n")
+        req_path = f.name
+
+    try:
+        subprocess.run(
+            base_cmd + ['--require-hashes', '-r', req_path],
+            check=True, capture_output=True, text=True
+        )
+    finally:
+        Path(req_path).unlink(missing_ok=True)
+
+
+def _fetch_prebuilt_wheel(url, dest):
+    """Download the pinned pre-built wheel into dest and return its path."""
+    subprocess.run([
+        sys.executable, '-m', 'pip', 'download', '--no-deps',
+        '--cache-dir', str(PIP_CACHE_DIR), '--dest', dest, url
+    ], check=True, capture_output=True, text=True)
+    return next(Path(dest).glob('*.whl'))
 
-def get_platform_wheel_url():
-    """Get platform-specific wheel URL for llama-cpp-python."""
-    system = platform.system().lower()
-    arch = platform.machine().lower()
-    
-    # Map architecture names
-    if arch in ['x86_64', 'amd64']:
-        arch = 'x86_64'
-    elif arch in ['arm64', 'aarch64']:
-        arch = 'arm64'
-    elif arch in ['armv7l']:
-        arch = 'armv7l'
-    
-    if system == 'darwin':  # macOS
-        if arch == 'arm64':
-            return "https://github.com/abetlen/llama-cpp-python/releases/download/v0.3.16/llama_cpp_python-0.3.16-cp311-cp311-macosx_11_0_arm64.whl"
-        else:
-            return "https://github.com/abetlen/llama-cpp-python/releases/download/v0.3.16/llama_cpp_python-0.3.16-cp311-cp311-macosx_10_9_x86_64.whl"
-    elif system == 'linux':
-        return "https://github.com/abetlen/llama-cpp-python/releases/download/v0.3.16/llama_cpp_python-0.3.16-cp311-cp311-linux_x86_64.whl"
-    elif system == 'windows':
-        return "https://github.com/abetlen/llama-cpp-python/releases/download/v0.3.16/llama_cpp_python-0.3.16-cp311-cp311-win_amd64.whl"
-    
-    return None
+
+def _fetch_extra_index_wheel(dest):
+    """Resolve llama-cpp-python from the CPU wheel index into dest."""
+    subprocess.run([
+        sys.executable, '-m', 'pip', 'download', '--no-deps', '--only-binary', ':all:',
+        '--cache-dir', str(PIP_CACHE_DIR), '--dest', dest, 'llama-cpp-python',
+        '--extra-index-url', 'https://abetlen.github.io/llama-cpp-python/whl/cpu'
+    ], check=True, capture_output=True, text=True)
+    return next(Path(dest).glob('*.whl'))
 
 
 def install_llama_cpp():
     """Install llama-cpp-python using the best method for the platform."""
     print("Installing llama-cpp-python...")
     print(f"Platform: {platform.system()} {platform.machine()}")
-    
-    # Try pre-built wheel first
-    wheel_url = get_platform_wheel_url()
-    
-    if wheel_url:
-        print(f"Trying pre-built wheel: {wheel_url}")
+
+    wheel = get_platform_wheel()
+
+    # A hash-pinned wheel is installed directly so the pin is verified
+    if wheel and wheel[1] is not None:
+        wheel_url, wheel_sha256 = wheel
+        print(f"Trying pinned pre-built wheel: {wheel_url}")
         try:
-            result = subprocess.run([
-                sys.executable, '-m', 'pip', 'install', wheel_url
-            ], check=True, capture_output=True, text=True)
+            install_pinned_wheel(wheel_url, wheel_sha256)
             print("✓ Successfully installed pre-built wheel")
             return True
         except subprocess.CalledProcessError as e:
             print(f"Pre-built wheel failed: {e}")
-            print("Falling back to compilation...")
-    
-    # Try extra index URL method
-    print("Trying extra index URL...")
-    try:
-        result = subprocess.run([
-            sys.executable, '-m', 'pip', 'install', 'llama-cpp-python',
-            '--extra-index-url', 'https://abetlen.github.io/llama-cpp-python/whl/cpu'
-        ], check=True, capture_output=True, text=True)
-        print("✓ Successfully installed from extra index")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Extra index URL failed: {e}")
-    
+
+    # Race the unpinned wheel download and the extra-index resolution;
+    # whichever wheel materializes first is installed from the local file
+    tmp_root = Path(tempfile.mkdtemp(prefix='llama-cpp-wheels-'))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {}
+        if wheel:
+            prebuilt_dir = tmp_root / 'prebuilt'
+            prebuilt_dir.mkdir()
+            futures[executor.submit(_fetch_prebuilt_wheel, wheel[0], str(prebuilt_dir))] = 'pre-built wheel'
+
+        extra_dir = tmp_root / 'extra-index'
+        extra_dir.mkdir()
+        futures[executor.submit(_fetch_extra_index_wheel, str(extra_dir))] = 'extra index'
+
+        for future in as_completed(futures):
+            strategy = futures[future]
+            try:
+                wheel_path = future.result()
+            except Exception as e:
+                print(f"{strategy} fetch failed: {e}")
+                continue
+
+            print(f"Installing wheel fetched via {strategy}: {wheel_path.name}")
+            try:
+                subprocess.run([
+                    sys.executable, '-m', 'pip', 'install',
+                    '--cache-dir', str(PIP_CACHE_DIR), str(wheel_path)
+                ], check=True, capture_output=True, text=True)
+                print(f"✓ Successfully installed from {strategy}")
+                executor.shutdown(wait=False, cancel_futures=True)
+                return True
+            except subprocess.CalledProcessError as e:
+                print(f"Install from {strategy} failed: {e}")
+
     # Last resort: compile from source
     print("Compiling from source (this may take 10-15 minutes)...")
     print("You can cancel with Ctrl+C and install manually later.")
@@ -81,10 +81,17 @@ def main():
     )
     
     parser.add_argument(
-        '--config', 
+        '--config',
         type=str,
         help='Path to configuration file'
     )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of parallel workers for parsing/chunking (default: scanning.max_workers)'
+    )
     
     parser.add_argument(
         '--dry-run', 
@@ -105,71 +112,85 @@ def main():
         print("System scan cancelled.")
         sys.exit(0)
     
+    # Buffered logging instead of per-line print: stdout round-trips to the
+    # kernel per line on a TTY, which adds up over large result reports
+    logger = setup_logging(log_level='INFO')
+
     try:
-        print("Initializing system scanner...")
-        
+        logger.info("Initializing system scanner...")
+
         # Initialize indexer
         indexer = DocumentIndexer(args.config)
-        
+
         if args.dry_run:
-            print("DRY RUN: Scanning to show what would be processed...")
-            
+            logger.info("DRY RUN: Scanning to show what would be processed...")
+
             # Just do the scan without indexing
             scan_result = indexer.document_loader.scan_documents('system')
             scan_summary = indexer.document_loader.get_scan_summary(scan_result)
-            
-            print("\nDry Run Results:")
-            print(f"Total files found: {scan_summary['total_files_found']}")
-            print(f"Documents to process: {scan_summary['total_documents']}")
-            print(f"Total size: {scan_summary['total_size_formatted']}")
-            print(f"File types: {scan_summary['file_types']}")
-            print(f"Directories scanned: {scan_summary['directories_scanned']}")
-            print(f"Permission errors: {scan_summary['permission_errors']}")
-            print(f"Skipped files: {scan_summary['skipped_files']}")
-            
+
+            logger.info(
+                "Dry Run Results:\n"
+                f"Total files found: {scan_summary['total_files_found']}\n"
+                f"Documents to process: {scan_summary['total_documents']}\n"
+                f"Total size: {scan_summary['total_size_formatted']}\n"
+                f"File types: {scan_summary['file_types']}\n"
+                f"Directories scanned: {scan_summary['directories_scanned']}\n"
+                f"Permission errors: {scan_summary['permission_errors']}\n"
+                f"Skipped files: {scan_summary['skipped_files']}"
+            )
+
             return
-        
+
         # Perform actual indexing
-        print("Starting system-wide document indexing...")
+        logger.info("Starting system-wide document indexing...")
         start_time = time.time()
         
         result = indexer.scan_and_index(
             scan_mode='system',
-            max_documents=args.max_documents
+            max_documents=args.max_documents,
+            workers=args.workers
         )
         
         if result.get('cancelled'):
-            print("Indexing was cancelled.")
+            logger.info("Indexing was cancelled.")
             return
-        
+
         total_time = time.time() - start_time
-        
-        print("\n" + "=" * 60)
-        print("SYSTEM SCAN COMPLETED")
-        print("=" * 60)
-        print(f"Documents indexed: {result['indexed_documents']}")
-        print(f"Total chunks created: {result['total_chunks']}")
-        print(f"Total time: {total_time:.2f} seconds")
-        print(f"Average processing speed: {result.get('documents_per_second', 0):.1f} docs/sec")
-        
         scan_result = result['scan_result']
-        print(f"\nFile Statistics:")
-        print(f"Total files scanned: {scan_result['total_files_found']}")
-        print(f"Total data size: {scan_result['total_size_formatted']}")
-        print(f"File types processed: {len(scan_result['file_types'])}")
-        print(f"Directories scanned: {scan_result['directories_scanned']}")
-        
+
+        lines = [
+            "=" * 60,
+            "SYSTEM SCAN COMPLETED",
+            "=" * 60,
+            f"Documents indexed: {result['indexed_documents']}",
+            f"Total chunks created: {result['total_chunks']}",
+            f"Total time: {total_time:.2f} seconds",
+            f"Average processing speed: {result.get('documents_per_second', 0):.1f} docs/sec",
+            "",
+            "File Statistics:",
+            f"Total files scanned: {scan_result['total_files_found']}",
+            f"Total data size: {scan_result['total_size_formatted']}",
+            f"File types processed: {len(scan_result['file_types'])}",
+            f"Directories scanned: {scan_result['directories_scanned']}",
+        ]
+
         if scan_result['permission_errors'] > 0:
-            print(f"Permission errors: {scan_result['permission_errors']}")
-        
+            lines.append(f"Permission errors: {scan_result['permission_errors']}")
+
         if scan_result['skipped_files'] > 0:
-            print(f"Skipped files: {scan_result['skipped_files']}")
-        
-        print("\nThe Local RAG Assistant now has access to documents from across the system.")
-        print("You can query this knowledge base using:")
-        print("  make run      # CLI interface")
-        print("  make web      # Web interface")
-        print("  make api      # API server")
+            lines.append(f"Skipped files: {scan_result['skipped_files']}")
+
+        lines.extend([
+            "",
+            "The Local RAG Assistant now has access to documents from across the system.",
+            "You can query this knowledge base using:",
+            "  make run      # CLI interface",
+            "  make web      # Web interface",
+            "  make api      # API server",
+        ])
+
+        logger.info("\n".join(lines))
         
     except KeyboardInterrupt:
         print("\nSystem scan interrupted by user.")
@@ -1,16 +1,281 @@
 """Document embedding functionality for Local RAG Assistant."""
 
+import hashlib
 import logging
+import sqlite3
 import numpy as np
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Union, Optional, Dict, Any
-from sentence_transformers import SentenceTransformer
-import torch
+from typing import List, Union, Optional, Dict, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 from ..utils.config import Configuration
 from ..utils.logging import get_logger
 
 
+class OnnxEncoder:
+    """SentenceTransformer-compatible encoder backed by ONNX Runtime.
+
+    Runs the exported transformer through onnxruntime's fused CPU kernels
+    instead of eager PyTorch, with mean pooling and L2 normalization done
+    in NumPy. Only the encode() subset used by DocumentEmbedder is provided.
+    """
+
+    def __init__(self, model_name: str, max_length: int):
+        """
+        Initialize the ONNX encoder.
+
+        Args:
+            model_name: HuggingFace model name to export and load.
+            max_length: Maximum token length per text.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise RuntimeError("optimum[onnxruntime] is not installed") from e
+
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_name,
+            export=True,
+            provider="CPUExecutionProvider"
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.max_length = max_length
+        self.device = "cpu"
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """
+        Get the dimension of embeddings produced by the model.
+
+        Returns:
+            Embedding dimension.
+        """
+        return int(self.model.config.hidden_size)
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = True
+    ) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts.
+
+        Args:
+            texts: List of text strings to embed.
+            batch_size: Batch size for processing.
+            show_progress_bar: Ignored (kept for SentenceTransformer compatibility).
+            convert_to_numpy: Ignored, output is always NumPy.
+            normalize_embeddings: Whether to L2-normalize the embeddings.
+
+        Returns:
+            Array of embeddings with shape (n_texts, embedding_dim).
+        """
+        if not texts:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        # Tokenize once without padding, then batch in token-length order so
+        # each batch pads to a similar length instead of wasting FLOPs when a
+        # long chunk lands next to short ones. Original order is restored below.
+        token_ids = self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=self.max_length
+        )["input_ids"]
+        order = np.argsort([len(ids) for ids in token_ids])
+
+        outputs = []
+
+        for start in range(0, len(texts), batch_size):
+            batch_idx = order[start:start + batch_size]
+            encoded = self.tokenizer.pad(
+                {"input_ids": [token_ids[i] for i in batch_idx]},
+                return_tensors="np"
+            )
+            hidden = self.model(**encoded).last_hidden_state
+
+            # Mean pooling over non-padding tokens
+            attention = encoded["attention_mask"][..., np.newaxis].astype(np.float32)
+            pooled = (hidden * attention).sum(axis=1) / np.clip(attention.sum(axis=1), 1e-9, None)
+            outputs.append(pooled)
+
+        embeddings = np.concatenate(outputs, axis=0)[np.argsort(order)]
+
+        if normalize_embeddings and len(embeddings):
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+
+        return embeddings
+
+
+class QueryCoalescer:
+    """Fuses concurrent query embeddings into batched forward passes.
+
+    Queries arriving within a short window are collected from an asyncio
+    queue and dispatched as one embed_queries() batch, the standard
+    server-side ML batching pattern for concurrent request handlers.
+    """
+
+    def __init__(self, embedder: "DocumentEmbedder", window_ms: float = 5.0, max_batch: int = 32):
+        """
+        Initialize the coalescer.
+
+        Args:
+            embedder: Embedder used to run the batched forward passes.
+            window_ms: How long to wait for more queries before dispatching.
+            max_batch: Maximum queries fused into one batch.
+        """
+        self.embedder = embedder
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: Optional["asyncio.Queue"] = None
+        self._worker = None
+
+    async def embed(self, query: str) -> np.ndarray:
+        """
+        Embed a query, transparently batching with concurrent callers.
+
+        Args:
+            query: Query string to embed.
+
+        Returns:
+            Query embedding array.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((query, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Drain the queue into batches and dispatch them off-loop."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+
+            # Collect whatever else arrives inside the window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                embeddings = await asyncio.to_thread(
+                    self.embedder.embed_queries,
+                    [query for query, _ in batch]
+                )
+                for (_, future), embedding in zip(batch, embeddings):
+                    if not future.done():
+                        future.set_result(embedding)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+class EmbeddingStore:
+    """Persistent on-disk embedding cache backed by SQLite."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize the embedding store.
+
+        Args:
+            path: Path to the SQLite database file.
+        """
+        self.logger = get_logger(__name__)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.path), isolation_level=None)
+        # WAL mode gives good read concurrency and cheap commits for the
+        # many-small-reads / short-write-bursts pattern of embedding lookups
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS emb (
+                h BLOB PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                v BLOB NOT NULL
+            )
+        """)
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Fetch cached embeddings for a list of keys.
+
+        Args:
+            keys: Content hash keys to look up.
+
+        Returns:
+            Mapping of key to embedding for every cache hit.
+        """
+        if not keys:
+            return {}
+
+        placeholders = ",".join("?" * len(keys))
+        rows = self.conn.execute(
+            f"SELECT h, v FROM emb WHERE h IN ({placeholders})",
+            list(keys)
+        ).fetchall()
+
+        # Embeddings are stored as float16 blobs to halve on-disk size
+        return {
+            row[0]: np.frombuffer(row[1], dtype=np.float16).astype(np.float32)
+            for row in rows
+        }
+
+    def put_many(self, items: List[tuple]) -> None:
+        """
+        Store embeddings in a single transaction.
+
+        Args:
+            items: List of (key, embedding) pairs.
+        """
+        rows = [
+            (key, int(embedding.shape[0]), embedding.astype(np.float16).tobytes())
+            for key, embedding in items
+        ]
+
+        if not rows:
+            return
+
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany("INSERT OR IGNORE INTO emb (h, dim, v) VALUES (?, ?, ?)", rows)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
 class DocumentEmbedder:
     """Handles document embedding using sentence transformers."""
     
@@ -23,24 +288,72 @@ class DocumentEmbedder:
         """
         self.config = config
         self.logger = get_logger(__name__)
-        self.model: Optional[SentenceTransformer] = None
-        self._embedding_cache: Dict[str, np.ndarray] = {}
+        self.model: Optional["SentenceTransformer"] = None
+
+        # Memoized after first use; both are fixed once the model is loaded
+        self._dim: Optional[int] = None
+        self._model_info: Optional[Dict[str, Any]] = None
+
+        # float16 halves cache footprint and memory bandwidth; it is only
+        # offered for the normalized-cosine path where precision loss is benign
+        self._output_dtype = np.float16 if config.embedding.precision == "float16" else np.float32
+        if self._output_dtype is np.float16 and not config.embedding.normalize_embeddings:
+            self.logger.warning("float16 precision requires normalized embeddings, using float32")
+            self._output_dtype = np.float32
+        # LRU cache keyed by BLAKE2b digest of the text. Digest keys are
+        # stable across processes (unlike salted hash()), so a persisted
+        # cache can be reloaded and reused between runs. The dict maps key
+        # to a row in a packed float16 matrix rather than holding N separate
+        # arrays, avoiding per-entry array-header overhead at large sizes.
+        self._embedding_cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._cache_rows: Optional[np.ndarray] = None
+
+        # Optional persistent cache so restarts don't re-embed known content
+        self._store: Optional[EmbeddingStore] = None
+        if config.performance.get("persistent_cache", False):
+            try:
+                self._store = EmbeddingStore(config.paths.index / "embedding_cache.db")
+            except Exception as e:
+                self.logger.warning(f"Failed to open persistent embedding cache: {e}")
         
     def load_model(self) -> None:
         """Load the embedding model."""
         try:
             self.logger.info(f"Loading embedding model: {self.config.embedding.model_name}")
-            
-            device = self.config.embedding.device
-            if device == "cuda" and not torch.cuda.is_available():
-                self.logger.warning("CUDA requested but not available, falling back to CPU")
-                device = "cpu"
-            
-            self.model = SentenceTransformer(
-                self.config.embedding.model_name,
-                device=device
-            )
-            
+
+            # Invalidate memoized model facts on (re)load
+            self._dim = None
+            self._model_info = None
+
+            backend = self.config.embedding.backend
+            if backend == "onnx":
+                try:
+                    self.model = OnnxEncoder(
+                        self.config.embedding.model_name,
+                        self.config.embedding.max_length
+                    )
+                    device = "cpu (onnxruntime)"
+                except RuntimeError as e:
+                    self.logger.warning(f"ONNX backend unavailable ({e}), using torch")
+                    backend = "torch"
+
+            if backend != "onnx":
+                # Heavy imports deferred so scripts that never embed
+                # (e.g. dry-run scans) don't pay torch's startup cost
+                import torch
+                from sentence_transformers import SentenceTransformer
+
+                device = self.config.embedding.device
+                if device == "cuda" and not torch.cuda.is_available():
+                    self.logger.warning("CUDA requested but not available, falling back to CPU")
+                    device = "cpu"
+
+                self.model = SentenceTransformer(
+                    self.config.embedding.model_name,
+                    device=device
+                )
+                self._sync_weight_cache(device)
+
             self.logger.info(f"Embedding model loaded successfully on {device}")
             self.logger.info(f"Model dimension: {self.get_embedding_dimension()}")
             
@@ -48,6 +361,41 @@ class DocumentEmbedder:
             self.logger.error(f"Failed to load embedding model: {e}")
             raise
     
+    def _sync_weight_cache(self, device: str) -> None:
+        """
+        Keep a shared mmap-able safetensors snapshot of the model weights.
+
+        Worker processes loading from the same snapshot share OS page cache,
+        so per-worker cold start drops and resident memory is deduplicated.
+
+        Args:
+            device: Device the model was loaded on.
+        """
+        try:
+            from safetensors.torch import save_file as save_safetensors, load_file as load_safetensors
+        except ImportError:
+            return
+
+        from ..utils.helpers import safe_filename
+
+        cache_path = (
+            Path.home() / ".cache" / "rag-persona" / "models"
+            / f"{safe_filename(self.config.embedding.model_name)}.safetensors"
+        )
+
+        try:
+            if cache_path.exists():
+                # Memory-mapped load: pages are shared across processes
+                self.model.load_state_dict(load_safetensors(str(cache_path), device=device))
+                self.logger.debug(f"Loaded mmap weight cache from {cache_path}")
+            else:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                state_dict = {k: v.contiguous() for k, v in self.model.state_dict().items()}
+                save_safetensors(state_dict, str(cache_path))
+                self.logger.debug(f"Wrote weight cache to {cache_path}")
+        except Exception as e:
+            self.logger.debug(f"Weight cache unavailable: {e}")
+
     def get_embedding_dimension(self) -> int:
         """
         Get the dimension of embeddings produced by the model.
@@ -60,8 +408,11 @@ class DocumentEmbedder:
         """
         if self.model is None:
             raise RuntimeError("Model not loaded. Call load_model() first.")
-        
-        return self.model.get_sentence_embedding_dimension()
+
+        if self._dim is None:
+            self._dim = self.model.get_sentence_embedding_dimension()
+
+        return self._dim
     
     def embed_texts(
         self, 
@@ -96,30 +447,23 @@ class DocumentEmbedder:
         self.logger.info(f"Embedding {len(texts)} texts with batch size {batch_size}")
         
         try:
-            # Filter out empty texts
-            non_empty_texts = [text for text in texts if text.strip()]
+            # Filter out empty texts (strip once, reuse the mask below)
+            mask = np.fromiter((bool(text.strip()) for text in texts), dtype=bool, count=len(texts))
+            non_empty_texts = [text for text, keep in zip(texts, mask) if keep]
             if len(non_empty_texts) != len(texts):
                 self.logger.warning(f"Filtered out {len(texts) - len(non_empty_texts)} empty texts")
-            
-            embeddings = self.model.encode(
-                non_empty_texts,
-                batch_size=batch_size,
-                show_progress_bar=show_progress,
-                convert_to_numpy=True,
-                normalize_embeddings=self.config.embedding.normalize_embeddings
-            )
-            
-            # Handle case where some texts were empty
+
+            embeddings = self._encode_texts(non_empty_texts, batch_size, show_progress)
+
+            # Handle case where some texts were empty: scatter the computed
+            # rows back into a full array with one vectorized assignment
             if len(non_empty_texts) != len(texts):
-                # Create full array and fill in embeddings for non-empty texts
-                full_embeddings = np.zeros((len(texts), embeddings.shape[1]))
-                non_empty_idx = 0
-                for i, text in enumerate(texts):
-                    if text.strip():
-                        full_embeddings[i] = embeddings[non_empty_idx]
-                        non_empty_idx += 1
+                full_embeddings = np.zeros((len(texts), embeddings.shape[1]), dtype=embeddings.dtype)
+                full_embeddings[mask] = embeddings
                 embeddings = full_embeddings
-            
+
+            embeddings = embeddings.astype(self._output_dtype, copy=False)
+
             self.logger.info(f"Generated embeddings with shape: {embeddings.shape}")
             return embeddings
             
@@ -127,6 +471,97 @@ class DocumentEmbedder:
             self.logger.error(f"Failed to generate embeddings: {e}")
             raise
     
+    def _encode_texts(
+        self,
+        texts: List[str],
+        batch_size: int,
+        show_progress: bool
+    ) -> np.ndarray:
+        """
+        Encode texts, deduplicating exact repeats before the forward pass.
+
+        Args:
+            texts: Non-empty texts to encode.
+            batch_size: Batch size for the model forward pass.
+            show_progress: Whether to show progress bar.
+
+        Returns:
+            Array of embeddings with shape (n_texts, embedding_dim).
+        """
+        # Real corpora repeat boilerplate chunks (headers, licenses, nav);
+        # run the model over unique strings only and scatter results back
+        unique: Dict[str, int] = {}
+        idx = np.empty(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            idx[i] = unique.setdefault(text, len(unique))
+
+        unique_texts = list(unique.keys())
+        if len(unique_texts) == len(texts):
+            return self._encode_unique(texts, batch_size, show_progress)
+
+        self.logger.info(f"Deduplicated {len(texts) - len(unique_texts)} repeated texts before encoding")
+        unique_embeddings = self._encode_unique(unique_texts, batch_size, show_progress)
+        return unique_embeddings[idx]
+
+    def _encode_unique(
+        self,
+        texts: List[str],
+        batch_size: int,
+        show_progress: bool
+    ) -> np.ndarray:
+        """
+        Encode texts, serving hits from the persistent store when enabled.
+
+        Args:
+            texts: Unique non-empty texts to encode.
+            batch_size: Batch size for the model forward pass.
+            show_progress: Whether to show progress bar.
+
+        Returns:
+            Array of embeddings with shape (n_texts, embedding_dim).
+        """
+        if self._store is None:
+            return self.model.encode(
+                texts,
+                batch_size=batch_size,
+                show_progress_bar=show_progress,
+                convert_to_numpy=True,
+                normalize_embeddings=self.config.embedding.normalize_embeddings
+            )
+
+        keys = [self._cache_key(text) for text in texts]
+        hits = self._store.get_many(keys)
+        miss_indices = [i for i, key in enumerate(keys) if key not in hits]
+
+        if hits:
+            self.logger.info(f"Persistent cache hit for {len(texts) - len(miss_indices)}/{len(texts)} texts")
+
+        if not miss_indices:
+            return np.stack([hits[key] for key in keys])
+
+        miss_embeddings = self.model.encode(
+            [texts[i] for i in miss_indices],
+            batch_size=batch_size,
+            show_progress_bar=show_progress,
+            convert_to_numpy=True,
+            normalize_embeddings=self.config.embedding.normalize_embeddings
+        )
+
+        # Persist the newly computed rows for future runs
+        try:
+            self._store.put_many([(keys[i], emb) for i, emb in zip(miss_indices, miss_embeddings)])
+        except Exception as e:
+            self.logger.warning(f"Failed to persist embeddings: {e}")
+
+        embeddings = np.empty((len(texts), miss_embeddings.shape[1]), dtype=np.float32)
+        for i, emb in zip(miss_indices, miss_embeddings):
+            embeddings[i] = emb
+        for i, key in enumerate(keys):
+            if key in hits:
+                embeddings[i] = hits[key]
+
+        return embeddings
+
     def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
@@ -138,24 +573,133 @@ class DocumentEmbedder:
             Embedding array with shape (embedding_dim,).
         """
         # Check cache first if caching is enabled
-        if self.config.performance.get("cache_embeddings", False):
-            text_hash = str(hash(text))
-            if text_hash in self._embedding_cache:
-                return self._embedding_cache[text_hash]
-        
+        cache_enabled = self.config.performance.get("cache_embeddings", False)
+        if cache_enabled:
+            key = self._cache_key(text)
+            cached = self._cache_lookup(key)
+            if cached is not None:
+                return cached
+
         embeddings = self.embed_texts([text], show_progress=False)
         embedding = embeddings[0]
-        
+
         # Cache the result if caching is enabled
-        if self.config.performance.get("cache_embeddings", False):
-            if len(self._embedding_cache) >= self.config.performance.get("cache_size", 1000):
-                # Remove oldest entry (simple FIFO)
-                oldest_key = next(iter(self._embedding_cache))
-                del self._embedding_cache[oldest_key]
-            
-            self._embedding_cache[text_hash] = embedding
-        
+        if cache_enabled:
+            self._cache_insert(key, embedding)
+
         return embedding
+
+    def _cache_lookup(self, key: bytes) -> Optional[np.ndarray]:
+        """
+        Look up a cached embedding and promote it to most recently used.
+
+        Args:
+            key: Cache key from _cache_key().
+
+        Returns:
+            Cached embedding or None on a miss.
+        """
+        row = self._embedding_cache.get(key)
+        if row is None:
+            return None
+
+        self._embedding_cache.move_to_end(key)
+        return np.asarray(self._cache_rows[row]).astype(self._output_dtype, copy=False)
+
+    def _cache_insert(self, key: bytes, embedding: np.ndarray) -> None:
+        """
+        Insert an embedding into the packed cache, evicting the LRU entry
+        when full.
+
+        Args:
+            key: Cache key from _cache_key().
+            embedding: Embedding to cache.
+        """
+        cache_size = self.config.performance.get("cache_size", 1000)
+
+        if self._cache_rows is None:
+            # Rows live in one packed float16 matrix; a memory-mapped file
+            # lets the OS evict cold pages instead of growing the heap
+            shape = (cache_size, embedding.shape[0])
+            try:
+                path = self.config.paths.index / "query_cache.dat"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._cache_rows = np.memmap(str(path), dtype=np.float16, mode='w+', shape=shape)
+            except OSError as e:
+                self.logger.debug(f"Falling back to in-memory cache rows: {e}")
+                self._cache_rows = np.zeros(shape, dtype=np.float16)
+
+        existing = self._embedding_cache.get(key)
+        if existing is not None:
+            self._embedding_cache.move_to_end(key)
+            row = existing
+        elif len(self._embedding_cache) >= cache_size:
+            # Reuse the slot of the least recently used entry
+            _, row = self._embedding_cache.popitem(last=False)
+        else:
+            row = len(self._embedding_cache)
+
+        self._cache_rows[row] = embedding.astype(np.float16, copy=False)
+        self._embedding_cache[key] = row
+
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        """
+        Compute a stable cache key for a text.
+
+        Args:
+            text: Text to compute key for.
+
+        Returns:
+            16-byte BLAKE2b digest of the text.
+        """
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def save_cache(self, path: Union[str, Path]) -> None:
+        """
+        Persist the embedding cache to disk.
+
+        Args:
+            path: Destination file path (.npz).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays = {
+            key.hex(): np.asarray(self._cache_rows[row])
+            for key, row in self._embedding_cache.items()
+        }
+        np.savez(str(path), **arrays)
+        self.logger.info(f"Saved {len(arrays)} cached embeddings to {path}")
+
+    def load_cache(self, path: Union[str, Path]) -> int:
+        """
+        Load a previously persisted embedding cache from disk.
+
+        Args:
+            path: Path to a cache file written by save_cache().
+
+        Returns:
+            Number of cache entries loaded.
+        """
+        path = Path(path)
+
+        if not path.exists():
+            self.logger.info(f"No embedding cache found at {path}")
+            return 0
+
+        try:
+            with np.load(str(path)) as data:
+                for hex_key in data.files:
+                    self._cache_insert(bytes.fromhex(hex_key), data[hex_key])
+
+            loaded = len(self._embedding_cache)
+            self.logger.info(f"Loaded {loaded} cached embeddings from {path}")
+            return loaded
+
+        except Exception as e:
+            self.logger.warning(f"Failed to load embedding cache from {path}: {e}")
+            return 0
     
     def embed_query(self, query: str) -> np.ndarray:
         """
@@ -168,7 +712,22 @@ class DocumentEmbedder:
             Query embedding array.
         """
         return self.embed_text(query)
-    
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for multiple queries in a single forward pass.
+
+        Prefer this over repeated embed_query() calls (e.g. query expansion,
+        HyDE): a batch amortizes the BLAS/GPU launch cost over all queries.
+
+        Args:
+            queries: Query strings to embed.
+
+        Returns:
+            Array of embeddings with shape (n_queries, embedding_dim).
+        """
+        return self.embed_texts(queries, show_progress=False)
+
     def similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
         Calculate cosine similarity between two embeddings.
@@ -180,6 +739,10 @@ class DocumentEmbedder:
         Returns:
             Cosine similarity score.
         """
+        # Upcast for the dot product so float16 inputs don't lose precision
+        embedding1 = embedding1.astype(np.float32, copy=False)
+        embedding2 = embedding2.astype(np.float32, copy=False)
+
         # Ensure embeddings are normalized
         if self.config.embedding.normalize_embeddings:
             # If embeddings are already normalized, dot product = cosine similarity
@@ -192,6 +755,35 @@ class DocumentEmbedder:
                 return 0.0
             return float(np.dot(embedding1, embedding2) / (norm1 * norm2))
     
+    def similarities(self, query_embedding: np.ndarray, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Calculate cosine similarity between a query and a batch of embeddings.
+
+        One BLAS matrix-vector product instead of N Python-level similarity()
+        calls. For best throughput, pass embeddings as a C-contiguous float32
+        (n, dim) matrix.
+
+        Args:
+            query_embedding: Query embedding with shape (embedding_dim,).
+            embeddings: Candidate embeddings with shape (n, embedding_dim).
+
+        Returns:
+            Array of similarity scores with shape (n,).
+        """
+        query_embedding = query_embedding.astype(np.float32, copy=False)
+        embeddings = embeddings.astype(np.float32, copy=False)
+
+        scores = embeddings @ query_embedding
+
+        if not self.config.embedding.normalize_embeddings:
+            # Normalize manually when embeddings aren't unit length
+            query_norm = np.linalg.norm(query_embedding)
+            row_norms = np.linalg.norm(embeddings, axis=1)
+            denom = row_norms * query_norm
+            scores = np.divide(scores, denom, out=np.zeros_like(scores), where=denom > 0)
+
+        return scores
+
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get information about the loaded model.
@@ -201,17 +793,22 @@ class DocumentEmbedder:
         """
         if self.model is None:
             return {"loaded": False}
-        
-        return {
-            "loaded": True,
-            "model_name": self.config.embedding.model_name,
-            "device": str(self.model.device),
-            "dimension": self.get_embedding_dimension(),
-            "max_length": self.config.embedding.max_length,
-            "normalize_embeddings": self.config.embedding.normalize_embeddings,
-            "cache_enabled": self.config.performance.get("cache_embeddings", False),
-            "cache_size": len(self._embedding_cache) if self.config.performance.get("cache_embeddings", False) else 0
-        }
+
+        if self._model_info is None:
+            self._model_info = {
+                "loaded": True,
+                "model_name": self.config.embedding.model_name,
+                "device": str(self.model.device),
+                "dimension": self.get_embedding_dimension(),
+                "max_length": self.config.embedding.max_length,
+                "normalize_embeddings": self.config.embedding.normalize_embeddings,
+                "cache_enabled": self.config.performance.get("cache_embeddings", False)
+            }
+
+        # Only the cache size changes between calls
+        info = dict(self._model_info)
+        info["cache_size"] = len(self._embedding_cache) if info["cache_enabled"] else 0
+        return info
     
     def clear_cache(self) -> None:
         """Clear the embedding cache."""
@@ -222,14 +819,12 @@ class DocumentEmbedder:
         """Clean up embedder resources."""
         try:
             self.clear_cache()
+            if self._store is not None:
+                self._store.close()
+                self._store = None
             if self.model is not None:
                 # Clear model from memory
                 del self.model
                 self.model = None
         except Exception as e:
             self.logger.warning(f"Error during embedder cleanup: {e}")
-    
-    def __del__(self):
-        """Cleanup when object is deleted."""
-        if hasattr(self, '_embedding_cache'):
-            self._embedding_cache.clear()
@@ -1,10 +1,12 @@
 """LLM generation functionality for Local RAG Assistant."""
 
+import functools
+import io
 import logging
+import os
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Generator
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Generator, NamedTuple
 
 try:
     from llama_cpp import Llama
@@ -16,8 +18,42 @@ from ..utils.logging import get_logger
 from .retriever import RetrievalResult
 
 
-@dataclass
-class GenerationResult:
+@functools.lru_cache(maxsize=4)
+def _compute_llama_kwargs(
+    model_path: str,
+    n_ctx: int,
+    threads: int,
+    n_gpu_layers: int,
+    use_mlock: bool
+) -> Dict[str, Any]:
+    """
+    Build the Llama constructor kwargs for one resolved config shape.
+
+    Memoized so a hot-reload that calls load_model() again with the same
+    settings skips re-deriving the kwargs, and so get_model_info can report
+    them without recomputation.
+    """
+    return {
+        'model_path': model_path,
+        'n_ctx': n_ctx,
+        'n_threads': threads,
+        # Large prompt batches keep the compute-bound prefill stage
+        # fed and avoid batch-allocation failures on long contexts
+        'n_batch': 2048,
+        'n_ubatch': 512,
+        'n_gpu_layers': n_gpu_layers,
+        'numa': False,
+        'offload_kqv': True,
+        # mmap + mlock keeps the quantized weights resident; CPU
+        # decode is memory-bandwidth bound and page evictions between
+        # decode steps cost far more than the locked RAM
+        'use_mmap': True,
+        'use_mlock': use_mlock,
+        'verbose': False
+    }
+
+
+class GenerationResult(NamedTuple):
     """Result from LLM generation."""
     text: str
     tokens_generated: int
@@ -39,14 +75,32 @@ class LLMGenerator:
         self.config = config
         self.logger = get_logger(__name__)
         self.model: Optional[Llama] = None
-        
+        self._llama_kwargs: Dict[str, Any] = {}
+
+        # The system prompt and context template repeat verbatim on every
+        # query, so their token counts are worth memoizing
+        self._count_tokens = functools.lru_cache(maxsize=1024)(self._count_tokens_uncached)
+
+        # Prompt strings never change between config reloads; cache them once
+        # instead of re-fetching and re-stripping on every query
+        self.reload_prompts()
+
         if Llama is None:
             self.logger.warning("llama-cpp-python not available - generation features disabled")
-    
-    def __del__(self):
-        """Cleanup resources when the object is deleted."""
-        self.cleanup()
-    
+
+    def reload_prompts(self) -> None:
+        """Refresh the cached system prompt and context template from config."""
+        self._system_prompt = self.config.prompts['system']
+        self._system_prompt_tokens: Optional[List[int]] = None
+        self._context_template = self.config.prompts.get('context_template', """
+Context from documents:
+{context}
+
+Question: {question}
+
+Answer based on the context above:
+        """).strip()
+
     def cleanup(self):
         """Clean up model resources to prevent memory leaks."""
         if self.model is not None:
@@ -69,28 +123,135 @@ class LLMGenerator:
                 except:
                     pass
     
+    @staticmethod
+    def _detect_threads() -> int:
+        """Detect a good llama.cpp thread count (physical cores, capped at 16)."""
+        physical = None
+        try:
+            import psutil
+            physical = psutil.cpu_count(logical=False)
+        except ImportError:
+            pass
+
+        # Memory-bound decode scales with physical cores, not SMT siblings
+        return min(16, max(1, physical or os.cpu_count() or 2))
+
+    def _should_mlock(self, model_path: Path) -> bool:
+        """
+        Decide whether to mlock the model weights.
+
+        Args:
+            model_path: Path to the model file.
+
+        Returns:
+            True when configured on, or on auto when there is comfortable
+            RAM headroom for the whole model.
+        """
+        setting = self.config.llm.use_mlock
+        if setting is not None:
+            return setting
+
+        try:
+            import psutil
+            return psutil.virtual_memory().available >= model_path.stat().st_size * 1.2
+        except (ImportError, OSError):
+            return False
+
     def load_model(self) -> None:
         """Load the LLM model."""
-        # EMERGENCY FIX: Completely disable LLM loading to prevent segfaults
-        self.logger.warning("LLM model loading disabled to prevent segmentation faults")
-        self.logger.info("System will run in search-only mode")
-        return
-        
-        # Original code disabled - causing segfaults on macOS
-        # if Llama is None:
-        #     self.logger.warning("Cannot load model: llama-cpp-python not installed")
-        #     return
-        #     
-        # model_path = Path(self.config.llm.model_path)
-        # 
-        # if not model_path.exists():
-        #     raise FileNotFoundError(f"Model file not found: {model_path}")
-        # 
-        # ... rest of model loading code disabled ...
+        if os.environ.get('RAG_SAFE_MODE') == '1':
+            # Escape hatch for platforms where llama.cpp crashes; the
+            # pipeline falls back to search-only mode
+            self.logger.warning("RAG_SAFE_MODE=1: LLM loading disabled, running in search-only mode")
+            return
+
+        if Llama is None:
+            self.logger.warning("Cannot load model: llama-cpp-python not installed")
+            return
+
+        model_path = Path(self.config.llm.model_path)
+
+        if not model_path.exists():
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+
+        threads = self.config.llm.threads
+        if threads <= 0:
+            threads = self._detect_threads()
+
+        use_mlock = self._should_mlock(model_path)
+
+        try:
+            self.logger.info(f"Loading LLM model: {model_path} ({threads} threads)")
+
+            # Kick off readahead on the weights file so the mmap'd pages are
+            # faulted in by the kernel while the constructor runs
+            try:
+                fd = os.open(model_path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            except (AttributeError, OSError):
+                pass
+
+            self._llama_kwargs = _compute_llama_kwargs(
+                str(model_path),
+                self.config.llm.context_length,
+                threads,
+                self.config.llm.n_gpu_layers,
+                use_mlock
+            )
+            self.model = Llama(**self._llama_kwargs)
+
+            # Prompt cache: the system prompt + context template prefix
+            # repeats verbatim every query and can skip re-prefill
+            try:
+                from llama_cpp import LlamaCache
+                self.model.set_cache(LlamaCache(capacity_bytes=512 << 20))
+            except Exception as e:
+                self.logger.debug(f"Prompt cache unavailable: {e}")
+
+            # One-token warmup pass: allocates KV buffers, compiles any GPU
+            # kernels and faults in remaining weight pages at startup instead
+            # of during the user's first query
+            try:
+                self.model("warmup", max_tokens=1, temperature=0.0)
+                self.model.reset()
+            except Exception as e:
+                self.logger.debug(f"Warmup generation failed: {e}")
+
+            self.logger.info(f"LLM model loaded successfully (mlock={use_mlock})")
+
+        except Exception as e:
+            self.logger.error(f"Failed to load LLM model: {e}")
+            raise
     
+    def prefill_system_prompt(self) -> None:
+        """
+        Evaluate the constant system-prompt prefix ahead of time.
+
+        The full prompt always starts with the system prompt, so evaluating
+        those tokens early lets the next generation reuse the live KV cache
+        for the shared prefix instead of re-prefilling it.
+        """
+        if self.model is None:
+            return
+
+        try:
+            # The prompt never changes between reloads, so tokenize it once
+            # and reuse the token list on every subsequent prefill
+            if self._system_prompt_tokens is None:
+                self._system_prompt_tokens = self.model.tokenize(
+                    self._system_prompt.encode('utf-8')
+                )
+            self.model.reset()
+            self.model.eval(self._system_prompt_tokens)
+        except Exception as e:
+            self.logger.debug(f"System prompt prefill skipped: {e}")
+
     def generate(
-        self, 
-        prompt: str, 
+        self,
+        prompt: str,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         top_p: Optional[float] = None,
@@ -131,18 +292,22 @@ class LLMGenerator:
             repeat_penalty = self.config.llm.repeat_penalty
         
         try:
-            start_time = time.time()
-            
+            start_time = time.perf_counter()
+
             if stream:
-                # Streaming generation
-                response_text = ""
+                # Streaming generation; collect chunks and join once rather
+                # than rebuilding the string on every `+=`
+                parts = []
                 for chunk in self._generate_stream(
                     prompt, max_tokens, temperature, top_p, top_k, repeat_penalty, stop_sequences
                 ):
-                    response_text += chunk
-                
-                generation_time = time.time() - start_time
-                tokens_generated = len(response_text.split())  # Rough estimate
+                    parts.append(chunk)
+                response_text = ''.join(parts)
+
+                generation_time = time.perf_counter() - start_time
+                # Each streamed chunk is one sampled token; counting chunks is
+                # exact, unlike the old whitespace-split estimate
+                tokens_generated = len(parts)
                 
             else:
                 # Non-streaming generation
@@ -157,11 +322,11 @@ class LLMGenerator:
                     echo=False
                 )
                 
-                generation_time = time.time() - start_time
+                generation_time = time.perf_counter() - start_time
                 response_text = response['choices'][0]['text'].strip()
                 tokens_generated = response['usage']['completion_tokens']
             
-            self.logger.debug(f"Generated {tokens_generated} tokens in {generation_time:.2f}s")
+            self.logger.debug("Generated %d tokens in %.2fs", tokens_generated, generation_time)
             
             return GenerationResult(
                 text=response_text,
@@ -257,8 +422,8 @@ class LLMGenerator:
         
         # Add source information
         if self.config.rag.include_sources:
-            result.sources = [doc.title for doc in context_documents]
-        
+            result = result._replace(sources=[doc.title for doc in context_documents])
+
         return result
     
     def _build_context(self, documents: List[RetrievalResult]) -> str:
@@ -273,29 +438,39 @@ class LLMGenerator:
         """
         if not documents:
             return ""
-        
-        context_parts = []
-        total_length = 0
+
         max_length = self.config.rag.max_context_length
-        
+
+        # Single pass with a running length total, writing straight into a
+        # StringIO buffer instead of building a parts list plus join
+        buf = io.StringIO()
+        total_length = 0
+
         for doc in documents:
-            # Format document
-            doc_text = f"[{doc.title}]\n{doc.content}"
-            
+            doc_length = len(doc.title) + len(doc.content) + 3  # brackets + newline
+
             # Check if adding this document would exceed max length
-            if total_length + len(doc_text) > max_length:
-                # Try to fit partial content
+            if total_length + doc_length > max_length:
+                # Try to fit partial content; the budget can go negative for
+                # long titles, so clamp before slicing
                 remaining_length = max_length - total_length
-                if remaining_length > 100:  # Only add if we have reasonable space
-                    truncated_content = doc.content[:remaining_length-len(doc.title)-10] + "..."
-                    doc_text = f"[{doc.title}]\n{truncated_content}"
-                    context_parts.append(doc_text)
+                header = f"[{doc.title}]\n"
+                body_budget = remaining_length - len(header) - 3
+                if remaining_length > 100 and body_budget > 0:
+                    if total_length:
+                        buf.write("\n\n")
+                    buf.write(header)
+                    buf.write(doc.content[:body_budget])
+                    buf.write("...")
                 break
-            
-            context_parts.append(doc_text)
-            total_length += len(doc_text) + 2  # +2 for separator
-        
-        return "\n\n".join(context_parts)
+
+            if total_length:
+                buf.write("\n\n")
+            buf.write(f"[{doc.title}]\n")
+            buf.write(doc.content)
+            total_length += doc_length + 2  # +2 for separator
+
+        return buf.getvalue()
     
     def _build_prompt(
         self, 
@@ -315,20 +490,10 @@ class LLMGenerator:
             Full prompt string.
         """
         if system_prompt is None:
-            system_prompt = self.config.prompts['system']
-        
-        # Use context template from config
-        context_template = self.config.prompts.get('context_template', """
-Context from documents:
-{context}
+            system_prompt = self._system_prompt
 
-Question: {question}
-
-Answer based on the context above:
-        """).strip()
-        
         if context:
-            full_prompt = f"{system_prompt}\n\n{context_template.format(context=context, question=query)}"
+            full_prompt = f"{system_prompt}\n\n{self._context_template.format(context=context, question=query)}"
         else:
             full_prompt = f"{system_prompt}\n\nQuestion: {query}\n\nAnswer:"
         
@@ -353,40 +518,70 @@ Answer based on the context above:
             "top_p": self.config.llm.top_p,
             "top_k": self.config.llm.top_k,
             "repeat_penalty": self.config.llm.repeat_penalty,
-            "threads": self.config.llm.threads
+            "threads": self._llama_kwargs.get("n_threads", self.config.llm.threads),
+            "llama_kwargs": dict(self._llama_kwargs)
         }
     
-    def estimate_token_count(self, text: str) -> int:
+    def _count_tokens_uncached(self, text: str) -> int:
         """
-        Estimate token count for text (rough approximation).
-        
+        Count tokens for a text using the model tokenizer when available.
+
         Args:
-            text: Text to estimate.
-            
+            text: Text to count.
+
         Returns:
-            Estimated token count.
+            Token count (heuristic fallback when no model is loaded).
         """
-        # Simple estimation: ~4 characters per token on average
+        if self.model is not None:
+            try:
+                return len(self.model.tokenize(text.encode('utf-8'), add_bos=False))
+            except Exception as e:
+                self.logger.debug(f"Tokenizer count failed, using heuristic: {e}")
+
+        # Fallback estimation: ~4 characters per token on average
         return len(text) // 4
-    
-    def can_fit_context(self, context: str, query: str, max_tokens: int = 512) -> bool:
+
+    def estimate_token_count(self, text: str) -> int:
+        """
+        Count tokens for text, memoized across repeated strings.
+
+        Args:
+            text: Text to count.
+
+        Returns:
+            Token count (exact when the model tokenizer is loaded).
+        """
+        return self._count_tokens(text)
+
+    def can_fit_context(
+        self,
+        context: str,
+        query: str,
+        max_tokens: int = 512,
+        stop_sequences: Optional[List[str]] = None
+    ) -> bool:
         """
         Check if context and query can fit within model's context window.
-        
+
         Args:
             context: Context text.
             query: Query text.
             max_tokens: Maximum tokens for generation.
-            
+            stop_sequences: Stop sequences, sized into the safety buffer.
+
         Returns:
             True if context fits, False otherwise.
         """
-        # Estimate tokens for context, query, system prompt, and generation
+        # Count tokens for context, query, system prompt, and generation
         context_tokens = self.estimate_token_count(context)
         query_tokens = self.estimate_token_count(query)
-        system_tokens = self.estimate_token_count(self.config.prompts['system'])
-        
-        total_input_tokens = context_tokens + query_tokens + system_tokens + 50  # Buffer
+        system_tokens = self.estimate_token_count(self._system_prompt)
+
+        # Small fixed margin plus room for each stop sequence, instead of
+        # a one-size-fits-all magic constant
+        buffer = 8 + sum(self.estimate_token_count(stop) for stop in (stop_sequences or []))
+
+        total_input_tokens = context_tokens + query_tokens + system_tokens + buffer
         total_tokens = total_input_tokens + max_tokens
-        
+
         return total_tokens <= self.config.llm.context_length
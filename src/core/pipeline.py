@@ -1,7 +1,9 @@
 """Main RAG pipeline for Local RAG Assistant."""
 
+import gc
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
@@ -12,7 +14,7 @@ from .retriever import VectorRetriever, RetrievalResult
 from .generator import LLMGenerator, GenerationResult
 
 
-@dataclass
+@dataclass(slots=True)
 class RAGResult:
     """Complete result from RAG pipeline."""
     query: str
@@ -112,22 +114,32 @@ class RAGPipeline:
         if not self._initialized:
             raise RuntimeError("Pipeline not initialized. Call initialize() first.")
         
-        start_time = time.time()
-        
+        start_time = time.perf_counter()
+
         try:
             # Step 1: Embed the query
-            self.logger.debug(f"Processing query: {query_text[:100]}...")
+            self.logger.debug("Processing query: %.100s...", query_text)
             query_embedding = self.embedder.embed_query(query_text)
             
-            # Step 2: Retrieve relevant documents
-            retrieval_start = time.time()
-            retrieved_docs = self.retriever.search(query_embedding, k)
-            retrieval_time = time.time() - retrieval_start
-            
-            self.logger.debug(f"Retrieved {len(retrieved_docs)} documents in {retrieval_time:.2f}s")
-            
+            # Step 2: Retrieve relevant documents. With async_prefill on, the
+            # vector search runs in a worker thread while the main thread
+            # pre-evaluates the constant system-prompt prefix; llama.cpp is
+            # not thread-safe, so the prefill stays on this thread and the
+            # search future is joined before any sampling starts.
+            retrieval_start = time.perf_counter()
+            if self.config.rag.async_prefill and self.generator.model is not None:
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    search_future = executor.submit(self.retriever.search, query_embedding, k)
+                    self.generator.prefill_system_prompt()
+                    retrieved_docs = search_future.result()
+            else:
+                retrieved_docs = self.retriever.search(query_embedding, k)
+            retrieval_time = time.perf_counter() - retrieval_start
+
+            self.logger.debug("Retrieved %d documents in %.2fs", len(retrieved_docs), retrieval_time)
+
             # Step 3: Generate response (if LLM is available)
-            generation_start = time.time()
+            generation_start = time.perf_counter()
             
             # Check if generator is available
             if not hasattr(self.generator, 'model') or self.generator.model is None:
@@ -162,37 +174,35 @@ class RAGPipeline:
                     'metadata': {'llm_available': False, 'search_only_mode': True}
                 })()
             else:
-                # LLM available, generate response
-                if retrieved_docs:
-                    generation_result = self.generator.generate_with_context(
-                        query_text, 
-                        retrieved_docs,
-                        stream=stream,
-                        **generation_kwargs
-                    )
-                else:
-                    # No context found, generate without context
+                # LLM available, generate response. An empty retrieval list
+                # flows through the same path: _build_prompt's no-context
+                # branch produces the identical question-only prompt that used
+                # to be hand-rolled here.
+                if not retrieved_docs:
                     self.logger.warning("No relevant documents found, generating without context")
-                    prompt = f"{self.config.prompts['system']}\n\nQuestion: {query_text}\n\nAnswer:"
-                    generation_result = self.generator.generate(
-                        prompt,
-                        stream=stream,
-                        **generation_kwargs
-                    )
+
+                generation_result = self.generator.generate_with_context(
+                    query_text,
+                    retrieved_docs,
+                    stream=stream,
+                    **generation_kwargs
+                )
             
-            generation_time = time.time() - generation_start
-            total_time = time.time() - start_time
+            generation_time = time.perf_counter() - generation_start
+            total_time = time.perf_counter() - start_time
             
-            # Format sources
-            sources = []
-            for doc in retrieved_docs:
-                sources.append({
+            # Format sources; the slice already bounds the preview, so the
+            # conditional only decides whether to append the ellipsis
+            sources = [
+                {
                     'title': doc.title,
                     'path': doc.path,
                     'score': doc.score,
                     'chunk_index': doc.chunk_index,
-                    'content_preview': doc.content[:200] + "..." if len(doc.content) > 200 else doc.content
-                })
+                    'content_preview': doc.content[:200] + ("..." if len(doc.content) > 200 else "")
+                }
+                for doc in retrieved_docs
+            ]
             
             result = RAGResult(
                 query=query_text,
@@ -210,7 +220,10 @@ class RAGPipeline:
                 }
             )
             
-            self.logger.info(f"Query processed in {total_time:.2f}s (retrieval: {retrieval_time:.2f}s, generation: {generation_time:.2f}s)")
+            self.logger.info(
+                "Query processed in %.2fs (retrieval: %.2fs, generation: %.2fs)",
+                total_time, retrieval_time, generation_time
+            )
             return result
             
         except Exception as e:
@@ -235,16 +248,27 @@ class RAGPipeline:
         
         try:
             self.logger.info(f"Adding {len(documents)} documents to knowledge base")
-            
-            # Extract content for embedding
-            contents = [doc['content'] for doc in documents]
-            
-            # Generate embeddings
-            embeddings = self.embedder.embed_texts(contents)
-            
-            # Add to retriever
-            self.retriever.add_documents(embeddings, documents)
-            
+
+            # Ingest in bounded batches so large ingests keep peak memory flat
+            # and the index grows incrementally instead of in one giant append
+            batch_size = max(1, self.config.embedding.ingest_batch_size)
+
+            for start in range(0, len(documents), batch_size):
+                batch = documents[start:start + batch_size]
+                contents = [doc['content'] for doc in batch]
+
+                # Generate embeddings
+                embeddings = self.embedder.embed_texts(contents)
+
+                # Add to retriever
+                self.retriever.add_documents(embeddings, batch)
+
+                if len(documents) > batch_size:
+                    self.logger.debug(
+                        f"Ingested {min(start + batch_size, len(documents))}/{len(documents)} documents"
+                    )
+                    gc.collect()
+
             self.logger.info(f"Successfully added {len(documents)} documents")
             return len(documents)
             
@@ -286,10 +310,14 @@ class RAGPipeline:
         if self._initialized:
             self.embedder.clear_cache()
     
-    def validate_setup(self) -> Dict[str, bool]:
+    def validate_setup(self, deep: bool = False) -> Dict[str, bool]:
         """
         Validate that all components are properly set up.
-        
+
+        Args:
+            deep: Actually load the embedding model instead of the cheap
+                availability probe. Costs seconds and hundreds of MB.
+
         Returns:
             Dictionary with validation results.
         """
@@ -300,12 +328,21 @@ class RAGPipeline:
             'index_directory_exists': False,
             'can_initialize': False
         }
-        
+
         try:
-            # Check if embedding model can be loaded
-            test_embedder = DocumentEmbedder(self.config)
-            test_embedder.load_model()
-            results['embedding_model_available'] = True
+            # Check embedding model availability. Reuse the pipeline's own
+            # embedder rather than loading a throwaway copy of the model;
+            # the default probe only checks the package is importable.
+            if self.embedder.model is not None:
+                results['embedding_model_available'] = True
+            elif deep:
+                self.embedder.load_model()
+                results['embedding_model_available'] = True
+            else:
+                import importlib.util
+                results['embedding_model_available'] = (
+                    importlib.util.find_spec('sentence_transformers') is not None
+                )
         except Exception as e:
             self.logger.warning(f"Embedding model validation failed: {e}")
         
@@ -352,16 +389,12 @@ class RAGPipeline:
     
     def cleanup(self):
         """Clean up pipeline resources to prevent memory leaks."""
+        # All three components implement cleanup(); call them directly so a
+        # rename surfaces as an AttributeError instead of being silently
+        # skipped behind hasattr
         try:
-            if hasattr(self.generator, 'cleanup'):
-                self.generator.cleanup()
-            if hasattr(self.embedder, 'cleanup'):
-                self.embedder.cleanup()
-            if hasattr(self.retriever, 'cleanup'):
-                self.retriever.cleanup()
+            self.generator.cleanup()
+            self.embedder.cleanup()
+            self.retriever.cleanup()
         except Exception as e:
             self.logger.warning(f"Error during pipeline cleanup: {e}")
-    
-    def __del__(self):
-        """Cleanup resources when the object is deleted."""
-        self.cleanup()
@@ -2,18 +2,45 @@
 
 import logging
 import sqlite3
+import threading
 import numpy as np
-import faiss
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    import faiss
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# zstd frame magic, used to tell compressed blobs from legacy plain rows
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
 from ..utils.config import Configuration
 from ..utils.logging import get_logger
 from ..utils.helpers import ensure_directory
 
+# Below this many vectors a SIMD scan over a contiguous buffer beats the
+# FAISS call overhead; above it, the buffer is dropped to save memory
+_SMALL_INDEX_THRESHOLD = 50_000
+
+
+def _as_f32c(array: np.ndarray) -> np.ndarray:
+    """Return array as C-contiguous float32, copying only when needed."""
+    if array.dtype == np.float32 and array.flags.c_contiguous:
+        return array
+    return np.ascontiguousarray(array, dtype=np.float32)
+
 
-@dataclass
+@dataclass(slots=True)
 class RetrievalResult:
     """Result from document retrieval."""
     doc_id: int
@@ -38,9 +65,65 @@ class VectorRetriever:
         self.logger = get_logger(__name__)
         self.index: Optional[faiss.Index] = None
         self.metadata_db_path = config.paths.index / "metadata.db"
-        
+
+        # Shadow copy of the vectors for the small-index SimSIMD scan path
+        self._vectors: Optional[np.ndarray] = None
+        self._vector_ids: Optional[np.ndarray] = None
+
+        # GPU residency state; the resources object must outlive the index
+        self._gpu_resources = None
+        self._on_gpu = False
+
+        # Background index snapshots: the writer thread serializes against
+        # index mutation through this lock
+        self._index_lock = threading.Lock()
+        self._save_thread: Optional[threading.Thread] = None
+
+        # Reservoir of vectors awaiting index training: IVF/PQ indices
+        # can't train on a single small ingest batch, so batches buffer
+        # here until enough points accumulate (or save_index forces it)
+        self._train_pending: List[np.ndarray] = []
+        self._train_pending_ids: List[np.ndarray] = []
+        self._train_pending_count = 0
+
+        # Chunk text compresses 3-5x, letting proportionally more of the
+        # text table stay resident in the page cache
+        self._zstd_compressor = (
+            zstandard.ZstdCompressor(level=3) if zstandard is not None else None
+        )
+        self._zstd_decompressor = (
+            zstandard.ZstdDecompressor() if zstandard is not None else None
+        )
+
         # Ensure index directory exists
         ensure_directory(config.paths.index)
+
+        # One long-lived connection: reconnecting per call reparses the
+        # schema and re-acquires file locks on every metadata access
+        self._db_lock = threading.Lock()
+        self._conn = self._open_metadata_db()
+
+        # IN-clause SQL per batch size, so repeated k-sized lookups hit the
+        # connection's prepared-statement cache instead of recompiling
+        self._in_sql_cache: Dict[int, str] = {}
+
+    def _open_metadata_db(self) -> sqlite3.Connection:
+        """Open the shared metadata connection with performance pragmas."""
+        conn = sqlite3.connect(
+            str(self.metadata_db_path),
+            check_same_thread=False,
+            # Default statement cache is 128; retrieval alternates between
+            # several query shapes, so give recompilation more headroom
+            cached_statements=256
+        )
+        # WAL lets readers proceed alongside a writer, NORMAL sync is safe
+        # under WAL, and the mmap/cache pragmas keep hot rows in memory
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
     
     def initialize_index(self, embedding_dimension: int) -> None:
         """
@@ -49,33 +132,106 @@ class VectorRetriever:
         Args:
             embedding_dimension: Dimension of embeddings.
         """
+        import faiss
+
         self.logger.info(f"Initializing new FAISS index with dimension {embedding_dimension}")
-        
+
         # Create appropriate index based on configuration
-        if self.config.vector_db.index_type == "IndexFlatIP":
+        index_type = self.config.vector_db.index_type
+        if self.config.vector_db.quantization == "sq8" and index_type in (
+            "IndexFlatIP", "IndexIVFFlat"
+        ):
+            # 8-bit scalar quantization: 4x smaller codes and 8-bit distance
+            # kernels, at a small recall cost. PQ/factory index types carry
+            # their own compression and ignore this setting.
+            factory = f"IVF{self.config.vector_db.nlist},SQ8"
+            self.logger.info(f"Building index via factory string: {factory}")
+            base_index = faiss.index_factory(
+                embedding_dimension, factory, faiss.METRIC_INNER_PRODUCT
+            )
+        elif index_type == "IndexFlatIP":
             # Inner Product index (for cosine similarity with normalized vectors)
             base_index = faiss.IndexFlatIP(embedding_dimension)
-        elif self.config.vector_db.index_type == "IndexFlatL2":
+        elif index_type == "IndexFlatL2":
             # L2 distance index
             base_index = faiss.IndexFlatL2(embedding_dimension)
-        elif self.config.vector_db.index_type == "IndexIVFFlat":
-            # IVF index for larger datasets
-            nlist = 100  # Number of clusters
-            quantizer = faiss.IndexFlatIP(embedding_dimension)
-            base_index = faiss.IndexIVFFlat(quantizer, embedding_dimension, nlist)
+        elif index_type == "IndexIVFFlat":
+            # IVF index for larger datasets. The HNSW coarse quantizer makes
+            # cluster assignment ~log(nlist) graph hops instead of nlist dot
+            # products, which keeps large nlist values affordable.
+            nlist = self.config.vector_db.nlist
+            quantizer = faiss.IndexHNSWFlat(
+                embedding_dimension, 32, faiss.METRIC_INNER_PRODUCT
+            )
+            quantizer.hnsw.efConstruction = 200
+            quantizer.hnsw.efSearch = 64
+            base_index = faiss.IndexIVFFlat(
+                quantizer, embedding_dimension, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+            base_index.nprobe = self.config.vector_db.nprobe
+        elif index_type == "IVFPQFastScan":
+            # SIMD fast-scan variant: 4-bit PQ codes packed into register-wide
+            # blocks so distances come from in-register table lookups, with a
+            # flat refinement pass restoring recall on the top candidates
+            m = self.config.vector_db.pq_m
+            factory = f"IVF{self.config.vector_db.nlist},PQ{m}x4fs,RFlat"
+            self.logger.info(f"Building index via factory string: {factory}")
+            base_index = faiss.index_factory(
+                embedding_dimension, factory, faiss.METRIC_INNER_PRODUCT
+            )
+        elif index_type == "IVFPQ" or "," in index_type:
+            # Compressed IVF-PQ pipeline for large corpora: the OPQ rotation
+            # conditions the vectors before product quantization, IVF limits
+            # the scan to nprobe clusters, and PQ codes shrink storage from
+            # 4*d bytes/vector to pq_m bytes. Arbitrary factory strings pass
+            # straight through for tuning.
+            if "," in index_type:
+                factory = index_type
+            else:
+                m = self.config.vector_db.pq_m
+                factory = (
+                    f"OPQ{m},IVF{self.config.vector_db.nlist},"
+                    f"PQ{m}x{self.config.vector_db.pq_nbits}"
+                )
+            self.logger.info(f"Building index via factory string: {factory}")
+            base_index = faiss.index_factory(
+                embedding_dimension, factory, faiss.METRIC_INNER_PRODUCT
+            )
         else:
             # Default to flat IP index
-            self.logger.warning(f"Unknown index type {self.config.vector_db.index_type}, using IndexFlatIP")
+            self.logger.warning(f"Unknown index type {index_type}, using IndexFlatIP")
             base_index = faiss.IndexFlatIP(embedding_dimension)
-        
-        # Wrap with IDMap to store document IDs
-        self.index = faiss.IndexIDMap(base_index)
+
+        # Document IDs are assigned sequentially from the current count, so
+        # FAISS's internal positions already equal them — no IDMap wrapper
+        # (and its 8 bytes/vector side table plus per-hit indirection) needed
+        self.index = base_index
+        self._configure_refine()
+        self._maybe_move_to_gpu()
         
         # Initialize metadata database
         self._initialize_metadata_db()
         
         self.logger.info("FAISS index initialized successfully")
     
+    def _configure_refine(self) -> None:
+        """Set the candidate-expansion factor on Refine-wrapped indices."""
+        if self.index is None:
+            return
+
+        import faiss
+
+        try:
+            # Indices saved by older versions may still carry an IDMap wrapper
+            inner = self.index.index if hasattr(self.index, 'id_map') else self.index
+            inner = faiss.downcast_index(inner)
+            if isinstance(inner, faiss.IndexRefine):
+                # Refine 10*k fast-scan candidates with exact distances; a
+                # generous factor because the 4-bit codes are coarse
+                inner.k_factor = 10
+        except (AttributeError, RuntimeError):
+            pass  # Flat or non-wrapped index
+
     def load_index(self) -> bool:
         """
         Load existing FAISS index from disk.
@@ -83,21 +239,34 @@ class VectorRetriever:
         Returns:
             True if index was loaded successfully, False otherwise.
         """
+        import faiss
+
         index_path = self.config.paths.index / "faiss.index"
-        
+
         if not index_path.exists():
             self.logger.info("No existing index found")
             return False
-        
+
         try:
             self.logger.info(f"Loading FAISS index from {index_path}")
             self.index = faiss.read_index(str(index_path))
-            
+            self._configure_refine()
+            self._load_shadow_vectors()
+            self._maybe_move_to_gpu()
+
+
             # Verify metadata database exists
             if not self.metadata_db_path.exists():
                 self.logger.warning("Index file exists but metadata database is missing")
                 return False
-            
+
+            # Ensure the schema is current: pre-split databases carry the
+            # chunk text in a documents.content column and have no
+            # documents_text table, so lookups would silently miss until
+            # the migration runs. Everything in there is IF NOT EXISTS,
+            # so up-to-date databases pass straight through.
+            self._initialize_metadata_db()
+
             self.logger.info(f"Index loaded successfully with {self.index.ntotal} vectors")
             return True
             
@@ -105,25 +274,208 @@ class VectorRetriever:
             self.logger.error(f"Failed to load index: {e}")
             return False
     
+    def _maybe_normalize(self, array: np.ndarray) -> np.ndarray:
+        """
+        L2-normalize vectors unless the embedder already emits unit vectors.
+
+        Inner-product indices only equal cosine similarity on normalized
+        input; when embedding.normalize_embeddings is off this closes the gap
+        exactly once, on a copy so callers' (possibly cached) arrays stay
+        untouched.
+        """
+        if self.config.embedding.normalize_embeddings:
+            return array
+
+        import faiss
+
+        array = array.copy()
+        faiss.normalize_L2(array)
+        return array
+
+    def _maybe_move_to_gpu(self) -> None:
+        """Move the index to GPU when configured and a CUDA build is present."""
+        if not self.config.vector_db.use_gpu or self.index is None:
+            return
+
+        import faiss
+
+        try:
+            self._gpu_resources = faiss.StandardGpuResources()
+            cloner_options = faiss.GpuClonerOptions()
+            # Half-precision storage doubles effective HBM bandwidth
+            cloner_options.useFloat16 = True
+            self.index = faiss.index_cpu_to_gpu(
+                self._gpu_resources, 0, self.index, cloner_options
+            )
+            self._on_gpu = True
+            self.logger.info("FAISS index moved to GPU")
+        except AttributeError:
+            self.logger.warning("use_gpu is set but this faiss build has no GPU support")
+        except Exception as e:
+            self.logger.warning(f"Failed to move index to GPU: {e}")
+
+    def _load_shadow_vectors(self) -> None:
+        """Rebuild the contiguous vector buffer for the small-index scan path."""
+        self._vectors = None
+        self._vector_ids = None
+
+        if simsimd is None or self.config.vector_db.index_type != "IndexFlatIP":
+            return
+        if self.index.ntotal == 0 or self.index.ntotal > _SMALL_INDEX_THRESHOLD:
+            return
+
+        import faiss
+
+        try:
+            if hasattr(self.index, 'id_map'):
+                # Legacy IDMap-wrapped index
+                inner = faiss.downcast_index(self.index.index)
+                self._vectors = inner.reconstruct_n(0, self.index.ntotal)
+                self._vector_ids = faiss.vector_to_array(self.index.id_map)
+            else:
+                self._vectors = self.index.reconstruct_n(0, self.index.ntotal)
+                self._vector_ids = np.arange(self.index.ntotal, dtype=np.int64)
+        except (AttributeError, RuntimeError) as e:
+            self.logger.debug(f"Shadow vector buffer unavailable: {e}")
+            self._vectors = None
+            self._vector_ids = None
+
+    def _search_small(self, query_embedding: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact top-k scan over the shadow buffer using SIMD distance kernels.
+
+        Args:
+            query_embedding: Query with shape (1, dim).
+            k: Number of results.
+
+        Returns:
+            Tuple of (scores, doc_ids) arrays sorted by descending score.
+        """
+        # Embeddings are L2-normalized, so cosine similarity equals the
+        # inner product the FAISS path computes
+        distances = np.asarray(
+            simsimd.cdist(query_embedding, self._vectors, metric="cosine"),
+            dtype=np.float32
+        )[0]
+        scores = 1.0 - distances
+
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        return scores[top], self._vector_ids[top]
+
     def save_index(self) -> None:
         """Save FAISS index to disk."""
         if self.index is None:
             raise RuntimeError("No index to save")
-        
+
+        import faiss
+
+
         index_path = self.config.paths.index / "faiss.index"
         
+        tmp_path = index_path.with_suffix(".index.tmp")
+
         try:
             self.logger.info(f"Saving FAISS index to {index_path}")
-            faiss.write_index(self.index, str(index_path))
+            with self._index_lock:
+                # Vectors still buffered for training must land in the
+                # snapshot; below the training threshold this falls back
+                # to an exact flat index
+                self._flush_training_buffer(force=True)
+                # GPU indices cannot be serialized directly
+                index_to_write = (
+                    faiss.index_gpu_to_cpu(self.index) if self._on_gpu else self.index
+                )
+                faiss.write_index(index_to_write, str(tmp_path))
+            # Atomic rename so a crash mid-write never corrupts the live index
+            tmp_path.replace(index_path)
             self.logger.info("Index saved successfully")
-            
+
         except Exception as e:
             self.logger.error(f"Failed to save index: {e}")
             raise
+
+    def _save_index_async(self) -> None:
+        """Snapshot the index to disk on a background thread."""
+        if self._save_thread is not None and self._save_thread.is_alive():
+            return  # A save is already in flight
+
+        def _save():
+            try:
+                self.save_index()
+            except Exception as e:
+                self.logger.warning(f"Background index save failed: {e}")
+
+        self._save_thread = threading.Thread(
+            target=_save, name="faiss-save", daemon=True
+        )
+        self._save_thread.start()
     
+    def _train_points_needed(self) -> int:
+        """Minimum buffered vectors before index training can succeed.
+
+        IVF k-means refuses fewer training points than clusters, and PQ
+        codebooks need at least 2^nbits points per sub-quantizer.
+        """
+        vdb = self.config.vector_db
+        return max(vdb.nlist, 1 << vdb.pq_nbits)
+
+    def _flush_training_buffer(self, force: bool = False) -> None:
+        """
+        Train the index on the buffered reservoir and add its vectors.
+
+        Called with _index_lock held. Does nothing until enough points
+        have accumulated, unless force is set (end of ingest), in which
+        case a corpus too small to train the configured index falls back
+        to an exact flat index — better recall than a starved IVF anyway.
+        """
+        if not self._train_pending:
+            return
+        if not force and self._train_pending_count < self._train_points_needed():
+            self.logger.debug(
+                f"Deferring index training: {self._train_pending_count}/"
+                f"{self._train_points_needed()} vectors buffered"
+            )
+            return
+
+        train_set = (
+            np.vstack(self._train_pending)
+            if len(self._train_pending) > 1 else self._train_pending[0]
+        )
+        doc_ids = (
+            np.concatenate(self._train_pending_ids)
+            if len(self._train_pending_ids) > 1 else self._train_pending_ids[0]
+        )
+
+        if self._train_pending_count < self._train_points_needed():
+            import faiss
+
+            self.logger.warning(
+                f"Only {len(train_set)} vectors available to train "
+                f"{self.config.vector_db.index_type}; using an exact flat "
+                f"index instead"
+            )
+            self.index = faiss.IndexFlatIP(train_set.shape[1])
+        else:
+            self.logger.info(f"Training index on {len(train_set)} vectors")
+            self.index.train(train_set)
+
+        if hasattr(self.index, 'id_map'):
+            self.index.add_with_ids(train_set, doc_ids)
+        else:
+            self.index.add(train_set)
+
+        self._train_pending.clear()
+        self._train_pending_ids.clear()
+        self._train_pending_count = 0
+
     def add_documents(
-        self, 
-        embeddings: np.ndarray, 
+        self,
+        embeddings: np.ndarray,
         metadata: List[Dict[str, Any]]
     ) -> None:
         """
@@ -146,17 +498,52 @@ class VectorRetriever:
             start_id = self.get_document_count()
             doc_ids = np.arange(start_id, start_id + len(embeddings), dtype=np.int64)
             
-            # Add to FAISS index
-            self.index.add_with_ids(embeddings.astype(np.float32), doc_ids)
+            embeddings32 = self._maybe_normalize(_as_f32c(embeddings))
+
+            with self._index_lock:
+                if not self.index.is_trained:
+                    # Trainable indices (IVF/PQ) can't learn nlist clusters
+                    # or 2^nbits codebook entries from one small ingest
+                    # batch — FAISS raises when training points < clusters.
+                    # Batches accumulate in a reservoir and the index trains
+                    # once enough points are buffered; metadata is written
+                    # immediately so document IDs stay sequential.
+                    self._train_pending.append(embeddings32)
+                    self._train_pending_ids.append(doc_ids)
+                    self._train_pending_count += len(embeddings32)
+                    self._flush_training_buffer()
+                else:
+                    # Add to FAISS index. New-style indices take sequential
+                    # internal IDs that match doc_ids by construction; legacy
+                    # IDMap-wrapped indices still need explicit IDs.
+                    if hasattr(self.index, 'id_map'):
+                        self.index.add_with_ids(embeddings32, doc_ids)
+                    else:
+                        self.index.add(embeddings32)
+
+            # Keep the SimSIMD shadow buffer in step while the index is small
+            if simsimd is not None and self.config.vector_db.index_type == "IndexFlatIP":
+                if self.index.ntotal > _SMALL_INDEX_THRESHOLD:
+                    self._vectors = None
+                    self._vector_ids = None
+                elif self._vectors is None and self.index.ntotal == len(embeddings32):
+                    self._vectors = embeddings32.copy()
+                    self._vector_ids = doc_ids.copy()
+                elif self._vectors is not None:
+                    self._vectors = np.vstack((self._vectors, embeddings32))
+                    self._vector_ids = np.concatenate((self._vector_ids, doc_ids))
             
             # Add metadata to database
             self._add_metadata(doc_ids, metadata)
             
             self.logger.info(f"Successfully added {len(embeddings)} documents")
             
-            # Save index periodically
-            if self.index.ntotal % self.config.vector_db.save_interval == 0:
-                self.save_index()
+            # Save index periodically without stalling the ingest thread;
+            # skipped while vectors are still buffered for training so the
+            # snapshot doesn't force a premature flush
+            if (self._train_pending_count == 0
+                    and self.index.ntotal % self.config.vector_db.save_interval == 0):
+                self._save_index_async()
                 
         except Exception as e:
             self.logger.error(f"Failed to add documents: {e}")
@@ -189,31 +576,52 @@ class VectorRetriever:
         
         try:
             # Ensure query embedding is the right shape and type
-            query_embedding = query_embedding.astype(np.float32)
+            query_embedding = _as_f32c(query_embedding)
             if query_embedding.ndim == 1:
                 query_embedding = query_embedding.reshape(1, -1)
+            query_embedding = self._maybe_normalize(query_embedding)
             
-            # Search the index
-            scores, doc_ids = self.index.search(query_embedding, min(k, self.index.ntotal))
-            
-            # Get metadata for results
+            if self._vectors is not None and len(self._vectors) == self.index.ntotal:
+                # Small index: exact SIMD scan over the contiguous buffer
+                # skips the FAISS binding and IDMap indirection
+                score_row, id_row = self._search_small(
+                    query_embedding, min(k, self.index.ntotal)
+                )
+            else:
+                import faiss
+
+                # For IVF variants, bound the scan to the configured probe count
+                try:
+                    faiss.extract_index_ivf(self.index).nprobe = self.config.vector_db.nprobe
+                except RuntimeError:
+                    pass  # Not an IVF index
+
+                # Search the index
+                scores, doc_ids = self.index.search(query_embedding, min(k, self.index.ntotal))
+                score_row, id_row = scores[0], doc_ids[0]
+
+            # Filter invalid IDs and sub-threshold scores with one vectorized
+            # mask before touching the database, then fetch all surviving rows
+            # in one query instead of one round-trip per hit
+            mask = (id_row != -1) & (score_row >= self.config.rag.min_similarity)
+            # tolist() converts to native int/float in C, replacing the
+            # per-element Python-level casts
+            good_ids = id_row[mask].astype(np.int64, copy=False).tolist()
+            good_scores = score_row[mask].astype(np.float64, copy=False).tolist()
+
+            metadata_by_id = self._get_metadata_batch(good_ids)
+
+            # Build results preserving FAISS's score order
             results = []
-            for score, doc_id in zip(scores[0], doc_ids[0]):
-                if doc_id == -1:  # Invalid ID
-                    continue
-                
-                # Apply minimum similarity threshold
-                if score < self.config.rag.min_similarity:
-                    continue
-                
-                metadata = self._get_metadata(int(doc_id))
+            for doc_id, score in zip(good_ids, good_scores):
+                metadata = metadata_by_id.get(doc_id)
                 if metadata:
                     results.append(RetrievalResult(
-                        doc_id=int(doc_id),
+                        doc_id=doc_id,
                         title=metadata['title'],
                         content=metadata['content'],
                         path=metadata['path'],
-                        score=float(score),
+                        score=score,
                         chunk_index=metadata.get('chunk_index', 0)
                     ))
             
@@ -224,6 +632,80 @@ class VectorRetriever:
             self.logger.error(f"Search failed: {e}")
             raise
     
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        k: Optional[int] = None
+    ) -> List[List[RetrievalResult]]:
+        """
+        Search for similar documents for several queries in one FAISS call.
+
+        Stacking queries lets FAISS amortize per-call overhead and use its
+        batched (GEMM-backed) distance kernels, so concurrent API requests
+        can be fused instead of paying the single-query path each.
+
+        Args:
+            query_embeddings: Query embeddings with shape (n_queries, dim).
+            k: Number of results per query. If None, uses config value.
+
+        Returns:
+            One list of retrieval results per query, in input order.
+        """
+        if self.index is None:
+            raise RuntimeError("Index not initialized")
+
+        if k is None:
+            k = self.config.rag.retrieval_k
+
+        queries = _as_f32c(query_embeddings)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        queries = self._maybe_normalize(queries)
+
+        if self.index.ntotal == 0:
+            self.logger.warning("Index is empty")
+            return [[] for _ in range(len(queries))]
+
+        try:
+            import faiss
+
+            try:
+                faiss.extract_index_ivf(self.index).nprobe = self.config.vector_db.nprobe
+            except RuntimeError:
+                pass  # Not an IVF index
+
+            scores, doc_ids = self.index.search(queries, min(k, self.index.ntotal))
+
+            # One metadata query covers every hit across the whole batch
+            mask = (doc_ids != -1) & (scores >= self.config.rag.min_similarity)
+            metadata_by_id = self._get_metadata_batch(
+                np.unique(doc_ids[mask]).astype(np.int64, copy=False).tolist()
+            )
+
+            batched_results = []
+            for row in range(len(queries)):
+                row_mask = mask[row]
+                results = []
+                for doc_id, score in zip(doc_ids[row][row_mask], scores[row][row_mask]):
+                    metadata = metadata_by_id.get(int(doc_id))
+                    if metadata:
+                        results.append(RetrievalResult(
+                            doc_id=int(doc_id),
+                            title=metadata['title'],
+                            content=metadata['content'],
+                            path=metadata['path'],
+                            score=float(score),
+                            chunk_index=metadata.get('chunk_index', 0)
+                        ))
+                batched_results.append(results)
+
+            self.logger.debug(f"Batched search served {len(queries)} queries")
+            return batched_results
+
+        except Exception as e:
+            self.logger.error(f"Batched search failed: {e}")
+            raise
+
     def get_document_count(self) -> int:
         """
         Get the total number of documents in the index.
@@ -233,7 +715,9 @@ class VectorRetriever:
         """
         if self.index is None:
             return 0
-        return self.index.ntotal
+        # Vectors buffered for training already have IDs and metadata, so
+        # they count — and the next batch's IDs stay sequential
+        return self.index.ntotal + self._train_pending_count
     
     def get_index_info(self) -> Dict[str, Any]:
         """
@@ -257,20 +741,30 @@ class VectorRetriever:
     def _initialize_metadata_db(self) -> None:
         """Initialize the metadata database."""
         try:
-            conn = sqlite3.connect(str(self.metadata_db_path))
-            cursor = conn.cursor()
-            
+            cursor = self._conn.cursor()
+
+            # Hot table keeps only the small ranking fields; the multi-KB
+            # chunk text lives in documents_text so far more hot rows fit in
+            # the page cache
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS documents (
                     id INTEGER PRIMARY KEY,
                     title TEXT NOT NULL,
-                    content TEXT NOT NULL,
                     path TEXT NOT NULL,
                     chunk_index INTEGER DEFAULT 0,
                     file_hash TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS documents_text (
+                    id INTEGER PRIMARY KEY,
+                    content TEXT NOT NULL
+                )
+            """)
+
+            self._migrate_content_column(cursor)
             
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_path ON documents(path)
@@ -279,38 +773,120 @@ class VectorRetriever:
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_file_hash ON documents(file_hash)
             """)
-            
-            conn.commit()
-            conn.close()
-            
+
+            # Covering indexes: path and hash lookups that only need ids and
+            # chunk positions answer from the index alone, skipping row fetches
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_path_covering
+                ON documents(path, id, chunk_index)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_hash_covering
+                ON documents(file_hash, id)
+            """)
+
+            self._conn.commit()
+
             self.logger.info("Metadata database initialized")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize metadata database: {e}")
             raise
     
+    def _pack_content(self, content: str):
+        """Compress chunk text for storage when zstandard is available."""
+        if self._zstd_compressor is None:
+            return content
+        return self._zstd_compressor.compress(content.encode('utf-8'))
+
+    def _unpack_content(self, stored) -> str:
+        """Restore chunk text from a stored row (compressed or legacy plain)."""
+        if isinstance(stored, bytes):
+            if stored.startswith(_ZSTD_MAGIC):
+                if self._zstd_decompressor is None:
+                    self.logger.warning("Compressed content found but zstandard is not installed")
+                    return ""
+                return self._zstd_decompressor.decompress(stored).decode('utf-8')
+            return stored.decode('utf-8', errors='replace')
+        return stored
+
+    def _migrate_content_column(self, cursor: sqlite3.Cursor) -> None:
+        """Move chunk text from a legacy documents.content column to documents_text."""
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(documents)")]
+        if 'content' not in columns:
+            return
+
+        self.logger.info("Migrating document text into documents_text")
+        cursor.execute("""
+            INSERT OR IGNORE INTO documents_text (id, content)
+            SELECT id, content FROM documents
+        """)
+
+        try:
+            cursor.execute("ALTER TABLE documents DROP COLUMN content")
+        except sqlite3.OperationalError:
+            # Older SQLite without DROP COLUMN: rebuild the table without
+            # the column instead. Leaving it in place is not an option —
+            # it is NOT NULL with no default, so every insert that omits
+            # it would fail. Runs before index creation, so the indexes
+            # dropped with the old table are recreated just after.
+            self.logger.info(
+                "SQLite build cannot drop columns; rebuilding documents table"
+            )
+            cursor.execute("DROP TABLE IF EXISTS documents_migrated")
+            cursor.execute("""
+                CREATE TABLE documents_migrated (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    chunk_index INTEGER DEFAULT 0,
+                    file_hash TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO documents_migrated
+                (id, title, path, chunk_index, file_hash, created_at)
+                SELECT id, title, path, chunk_index, file_hash, created_at
+                FROM documents
+            """)
+            cursor.execute("DROP TABLE documents")
+            cursor.execute("ALTER TABLE documents_migrated RENAME TO documents")
+
     def _add_metadata(self, doc_ids: np.ndarray, metadata: List[Dict[str, Any]]) -> None:
         """Add metadata to the database."""
+        rows = [
+            (
+                int(doc_id),
+                meta.get('title', ''),
+                meta.get('path', ''),
+                meta.get('chunk_index', 0),
+                meta.get('file_hash', '')
+            )
+            for doc_id, meta in zip(doc_ids, metadata)
+        ]
+        text_rows = [
+            (int(doc_id), self._pack_content(meta.get('content', '')))
+            for doc_id, meta in zip(doc_ids, metadata)
+        ]
+
         try:
-            conn = sqlite3.connect(str(self.metadata_db_path))
-            cursor = conn.cursor()
-            
-            for doc_id, meta in zip(doc_ids, metadata):
-                cursor.execute("""
-                    INSERT INTO documents (id, title, content, path, chunk_index, file_hash)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    int(doc_id),
-                    meta.get('title', ''),
-                    meta.get('content', ''),
-                    meta.get('path', ''),
-                    meta.get('chunk_index', 0),
-                    meta.get('file_hash', '')
-                ))
-            
-            conn.commit()
-            conn.close()
-            
+            with self._db_lock:
+                # executemany binds parameters in C and the whole batch
+                # (both tables) commits as one WAL transaction
+                self._conn.executemany("""
+                    INSERT INTO documents (id, title, path, chunk_index, file_hash)
+                    VALUES (?, ?, ?, ?, ?)
+                """, rows)
+
+                self._conn.executemany("""
+                    INSERT INTO documents_text (id, content)
+                    VALUES (?, ?)
+                """, text_rows)
+
+                self._conn.commit()
+
         except Exception as e:
             self.logger.error(f"Failed to add metadata: {e}")
             raise
@@ -318,22 +894,20 @@ class VectorRetriever:
     def _get_metadata(self, doc_id: int) -> Optional[Dict[str, Any]]:
         """Get metadata for a document ID."""
         try:
-            conn = sqlite3.connect(str(self.metadata_db_path))
-            cursor = conn.cursor()
-            
+            cursor = self._conn.cursor()
+
             cursor.execute("""
-                SELECT title, content, path, chunk_index, file_hash, created_at
-                FROM documents
-                WHERE id = ?
+                SELECT d.title, t.content, d.path, d.chunk_index, d.file_hash, d.created_at
+                FROM documents d JOIN documents_text t USING (id)
+                WHERE d.id = ?
             """, (doc_id,))
-            
+
             row = cursor.fetchone()
-            conn.close()
-            
+
             if row:
                 return {
                     'title': row[0],
-                    'content': row[1],
+                    'content': self._unpack_content(row[1]),
                     'path': row[2],
                     'chunk_index': row[3],
                     'file_hash': row[4],
@@ -346,6 +920,51 @@ class VectorRetriever:
             self.logger.error(f"Failed to get metadata for doc_id {doc_id}: {e}")
             return None
     
+    def _get_metadata_batch(self, doc_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get metadata for a batch of document IDs with a single query.
+
+        Args:
+            doc_ids: Document IDs to look up.
+
+        Returns:
+            Mapping of document ID to metadata dictionary.
+        """
+        if not doc_ids:
+            return {}
+
+        try:
+            cursor = self._conn.cursor()
+
+            sql = self._in_sql_cache.get(len(doc_ids))
+            if sql is None:
+                placeholders = ",".join("?" * len(doc_ids))
+                sql = f"""
+                    SELECT id, d.title, t.content, d.path, d.chunk_index, d.file_hash, d.created_at
+                    FROM documents d JOIN documents_text t USING (id)
+                    WHERE id IN ({placeholders})
+                """
+                self._in_sql_cache[len(doc_ids)] = sql
+            cursor.execute(sql, doc_ids)
+
+            rows = cursor.fetchall()
+
+            return {
+                row[0]: {
+                    'title': row[1],
+                    'content': self._unpack_content(row[2]),
+                    'path': row[3],
+                    'chunk_index': row[4],
+                    'file_hash': row[5],
+                    'created_at': row[6]
+                }
+                for row in rows
+            }
+
+        except Exception as e:
+            self.logger.error(f"Failed to get metadata batch: {e}")
+            return {}
+
     def remove_documents_by_path(self, file_path: str) -> int:
         """
         Remove documents by file path (useful for updates).
@@ -357,23 +976,33 @@ class VectorRetriever:
             Number of documents removed.
         """
         try:
-            conn = sqlite3.connect(str(self.metadata_db_path))
-            cursor = conn.cursor()
-            
-            # Get document IDs to remove
-            cursor.execute("SELECT id FROM documents WHERE path = ?", (file_path,))
-            doc_ids = [row[0] for row in cursor.fetchall()]
-            
-            if not doc_ids:
-                conn.close()
-                return 0
-            
-            # Remove from metadata database
-            cursor.execute("DELETE FROM documents WHERE path = ?", (file_path,))
-            removed_count = cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+            with self._db_lock:
+                cursor = self._conn.cursor()
+
+                try:
+                    # One statement deletes and reports the removed IDs
+                    cursor.execute(
+                        "DELETE FROM documents WHERE path = ? RETURNING id",
+                        (file_path,)
+                    )
+                    doc_ids = [row[0] for row in cursor.fetchall()]
+                except sqlite3.OperationalError:
+                    # SQLite < 3.35 has no RETURNING; fall back to two steps
+                    cursor.execute("SELECT id FROM documents WHERE path = ?", (file_path,))
+                    doc_ids = [row[0] for row in cursor.fetchall()]
+                    cursor.execute("DELETE FROM documents WHERE path = ?", (file_path,))
+
+                if not doc_ids:
+                    return 0
+
+                placeholders = ",".join("?" * len(doc_ids))
+                cursor.execute(
+                    f"DELETE FROM documents_text WHERE id IN ({placeholders})",
+                    doc_ids
+                )
+
+                removed_count = len(doc_ids)
+                self._conn.commit()
             
             # Note: FAISS doesn't support efficient removal, so we'd need to rebuild
             # the index for true removal. For now, we just remove from metadata.
@@ -388,10 +1017,18 @@ class VectorRetriever:
     def cleanup(self) -> None:
         """Clean up retriever resources."""
         try:
+            if self._save_thread is not None and self._save_thread.is_alive():
+                # Let an in-flight snapshot finish before tearing down
+                self._save_thread.join()
             if self.index is not None:
                 # Clear FAISS index from memory
                 del self.index
                 self.index = None
                 self.logger.debug("FAISS index cleared from memory")
+            if self._conn is not None:
+                # Refresh query-planner statistics before shutting down
+                self._conn.execute("PRAGMA optimize")
+                self._conn.close()
+                self._conn = None
         except Exception as e:
             self.logger.warning(f"Error during retriever cleanup: {e}")
\ No newline at end of file
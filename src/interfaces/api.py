@@ -3,7 +3,7 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
-import uvicorn
+import asyncio
 import sys
 from pathlib import Path
 
@@ -59,7 +59,9 @@ async def startup_event():
     try:
         config = load_config()
         pipeline = RAGPipeline(config)
-        pipeline.initialize_pipeline()
+        # Model loading and index reads take seconds; keep them off the
+        # event loop so the server stays responsive during startup
+        await asyncio.to_thread(pipeline.initialize)
         print("✅ RAG Pipeline initialized successfully!")
     except Exception as e:
         print(f"❌ Failed to initialize pipeline: {e}")
@@ -107,23 +109,26 @@ async def query_documents(request: QueryRequest):
         import time
         start_time = time.time()
         
-        # Process query
-        response = pipeline.query(request.question)
+        # Process query in a worker thread: embedding, FAISS search and
+        # generation all hold the CPU and would otherwise pin the event
+        # loop for the whole request
+        response = await asyncio.to_thread(pipeline.query, request.question)
         
         processing_time = time.time() - start_time
         
-        # Format sources
+        # Format sources; pipeline.query returns a RAGResult whose source
+        # dicts carry a content_preview rather than the full chunk text
         sources = []
-        for source in response.get("sources", []):
+        for source in response.sources or []:
             sources.append(Source(
                 title=source.get("title", "Unknown"),
                 path=source.get("path", ""),
-                content=source.get("content", ""),
+                content=source.get("content_preview", ""),
                 score=source.get("score", 0.0)
             ))
-        
+
         return QueryResponse(
-            answer=response.get("answer", "No answer generated"),
+            answer=response.answer or "No answer generated",
             sources=sources[:request.max_sources],
             query=request.question,
             processing_time=processing_time
@@ -148,6 +153,8 @@ async def get_document_count():
 
 def main():
     """Run the API server."""
+    import uvicorn
+
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
 
@@ -1,5 +1,6 @@
 """Command-line interface for Local RAG Assistant."""
 
+import os
 import sys
 import time
 import signal
@@ -7,21 +8,13 @@ import atexit
 from pathlib import Path
 from typing import Optional
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.text import Text
-from rich.markdown import Markdown
 
-# Add parent directory to path for imports
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Heavy imports (pipeline, licensing, rich) are deferred into the methods
+# that need them so `--help` and argument errors don't pay the multi-second
+# cost of pulling in the embedding and LLM stacks.
 
-from src.core.pipeline import RAGPipeline
-from src.utils.config import load_config, ensure_directories
-from src.utils.logging import setup_logging
-from src.licensing.validator import LicenseValidator
+# How long a license validation result may be reused before re-verifying
+_LICENSE_CACHE_TTL = 60.0
 
 
 class RAGAssistantCLI:
@@ -29,11 +22,17 @@ class RAGAssistantCLI:
     
     def __init__(self):
         """Initialize the CLI."""
+        from rich.console import Console
+
         self.console = Console()
         self.config = None
         self.pipeline = None
         self.license_validator = None
         self.current_license = None
+        self.current_license_expiry_str = None
+        self._license_generator = None
+        self._keygen_future = None
+        self._license_cache = {}
         
         # Register cleanup handlers
         atexit.register(self.cleanup)
@@ -49,6 +48,9 @@ class RAGAssistantCLI:
     def setup(self) -> bool:
         """Setup the CLI application."""
         try:
+            from src.utils.config import load_config, ensure_directories
+            from src.utils.logging import setup_logging
+
             # Load configuration
             self.config = load_config()
             ensure_directories(self.config)
@@ -66,9 +68,20 @@ class RAGAssistantCLI:
                 **logging_config
             )
             
-            # Initialize license validator
-            self.license_validator = LicenseValidator(self.config)
-            
+            # First run only: start RSA key generation in the background so
+            # the 100-500ms keygen overlaps with pipeline initialization
+            if self.config.licensing.get('enabled', True):
+                from src.licensing.generator import LicenseGenerator
+
+                generator = LicenseGenerator(self.config)
+                if not generator.keys_exist():
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    executor = ThreadPoolExecutor(max_workers=1)
+                    self._keygen_future = executor.submit(generator.generate_rsa_keys)
+                    executor.shutdown(wait=False)
+                self._license_generator = generator
+
             return True
             
         except Exception as e:
@@ -79,30 +92,57 @@ class RAGAssistantCLI:
         """Check for valid license."""
         if not self.config.licensing.get('enabled', True):
             return True
-        
-        # Look for license files
-        license_files = list(self.config.paths.licenses.glob("*.txt"))
+
+        # Validator construction (and its usage-db init) is deferred to
+        # here so disabled deployments skip crypto setup entirely
+        from src.licensing.validator import LicenseValidator
+
+        self.license_validator = LicenseValidator(self.config)
+
+        # Look for license files; scandir avoids glob's fnmatch machinery
+        # and per-candidate Path construction for a flat directory
+        try:
+            license_files = [
+                entry.path
+                for entry in os.scandir(self.config.paths.licenses)
+                if entry.name.endswith('.txt') and entry.is_file()
+            ]
+        except FileNotFoundError:
+            license_files = []
         
         if not license_files:
             self.console.print("[yellow]No license file found. Generating demo license...[/yellow]")
-            from src.licensing.generator import LicenseGenerator
-            generator = LicenseGenerator(self.config)
-            
-            if not generator.keys_exist():
+            generator = self._license_generator
+            if generator is None:
+                from src.licensing.generator import LicenseGenerator
+                generator = LicenseGenerator(self.config)
+
+            # Join the background keygen started in setup(), or generate
+            # synchronously if it never ran
+            if self._keygen_future is not None:
+                self._keygen_future.result()
+                self._keygen_future = None
+            elif not generator.keys_exist():
                 generator.generate_rsa_keys()
-            
+
             demo_license = generator.create_demo_license()
             license_path = generator.save_license(demo_license, "demo_license.txt")
             self.console.print(f"[green]Demo license created: {license_path}[/green]")
-            license_files = [license_path]
+            license_files = [str(license_path)]
         
         # Validate the first available license
         for license_file in license_files:
-            token = self.license_validator.load_license_from_file(str(license_file))
+            token = self.license_validator.load_license_from_file(license_file)
             if token:
-                is_valid, validation_info = self.license_validator.validate_license(token)
+                is_valid, validation_info = self._cached_validate(token)
                 if is_valid:
                     self.current_license = token
+                    # Pre-format the expiry date once; strftime/localtime
+                    # rebuild timezone state on every call otherwise
+                    self.current_license_expiry_str = time.strftime(
+                        '%Y-%m-%d',
+                        time.localtime(validation_info['data'].get('expires_at', 0))
+                    )
                     plan = validation_info['data'].get('plan', 'unknown')
                     remaining = validation_info.get('remaining_queries', 0)
                     self.console.print(f"[green]Valid {plan} license loaded ({remaining} queries remaining)[/green]")
@@ -113,30 +153,65 @@ class RAGAssistantCLI:
         self.console.print("[red]No valid license found. Please contact support.[/red]")
         return False
     
-    def initialize_pipeline(self) -> bool:
-        """Initialize the RAG pipeline."""
-        try:
+    def _cached_validate(self, token: str):
+        """
+        Validate a license token, reusing a recent result.
+
+        Tokens are immutable and usage counters move one query at a time, so
+        the base64 + JSON + RSA verification work can be reused briefly
+        instead of re-running on every query and UI command. The cache entry
+        is dropped whenever usage is recorded.
+        """
+        entry = self._license_cache.get(token)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < _LICENSE_CACHE_TTL:
+            return entry[1]
+
+        result = self.license_validator.validate_license(token)
+        self._license_cache[token] = (now, result)
+        return result
+
+    def _run_with_spinner(self, description: str, func):
+        """
+        Run func on a worker thread, showing a spinner only if it's slow.
+
+        rich's Progress spawns a render thread and repaints the terminal,
+        which dominates for sub-second work; the spinner only appears once
+        the task has already been running for 150ms.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(func)
+            try:
+                return future.result(timeout=0.15)
+            except FutureTimeoutError:
+                pass
+
+            from rich.progress import Progress, SpinnerColumn, TextColumn
+
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 console=self.console,
                 transient=True
             ) as progress:
-                
-                # Step 1: Validate setup
-                task = progress.add_task("Validating setup...", total=None)
+                progress.add_task(description, total=None)
+                return future.result()
+
+    def initialize_pipeline(self) -> bool:
+        """Initialize the RAG pipeline."""
+        from src.core.pipeline import RAGPipeline
+
+        try:
+            def _init():
                 self.pipeline = RAGPipeline(self.config)
-                validation_results = self.pipeline.validate_setup()
-                
-                # Show validation results
-                progress.update(task, description="Checking components...")
-                
-                # Step 2: Initialize with better error reporting
-                progress.update(task, description="Initializing RAG pipeline...")
+                self.pipeline.validate_setup()
                 self.pipeline.initialize()
-                
-                progress.update(task, description="Pipeline ready!")
-            
+
+            self._run_with_spinner("Initializing RAG pipeline...", _init)
+
             return True
             
         except Exception as e:
@@ -159,6 +234,9 @@ class RAGAssistantCLI:
     
     def show_welcome(self) -> None:
         """Show welcome message."""
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+
         # Check if LLM is available
         llm_status = "Available" if (self.pipeline and 
                                    hasattr(self.pipeline.generator, 'model') and 
@@ -186,6 +264,9 @@ Type 'help' for commands, 'quit' to exit.
     
     def show_help(self) -> None:
         """Show help information."""
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+
         help_text = """
 **Available Commands:**
 
@@ -209,6 +290,8 @@ knowledge base and provide an answer with source citations.
     
     def show_stats(self) -> None:
         """Show system statistics."""
+        from rich.table import Table
+
         if not self.pipeline:
             self.console.print("[red]Pipeline not initialized[/red]")
             return
@@ -237,11 +320,13 @@ knowledge base and provide an answer with source citations.
     
     def show_license_info(self) -> None:
         """Show license information."""
+        from rich.table import Table
+
         if not self.current_license:
             self.console.print("[red]No license loaded[/red]")
             return
         
-        is_valid, validation_info = self.license_validator.validate_license(self.current_license)
+        is_valid, validation_info = self._cached_validate(self.current_license)
         usage = self.license_validator.get_license_usage(self.current_license)
         
         license_data = validation_info.get('data', {})
@@ -253,7 +338,10 @@ knowledge base and provide an answer with source citations.
         table.add_row("Plan", license_data.get('plan', 'unknown'))
         table.add_row("User ID", license_data.get('user_id', 'unknown'))
         table.add_row("Valid", "✓" if is_valid else "✗")
-        table.add_row("Expires", time.strftime('%Y-%m-%d', time.localtime(license_data.get('expires_at', 0))))
+        expires_str = self.current_license_expiry_str or time.strftime(
+            '%Y-%m-%d', time.localtime(license_data.get('expires_at', 0))
+        )
+        table.add_row("Expires", expires_str)
         table.add_row("Max Queries/Day", str(license_data.get('max_queries_per_day', 0)))
         table.add_row("Remaining Today", str(validation_info.get('remaining_queries', 0)))
         
@@ -273,27 +361,20 @@ knowledge base and provide an answer with source citations.
         # Record query usage if license is active
         if self.current_license:
             # Pre-validate license
-            is_valid, validation_info = self.license_validator.validate_license(self.current_license)
+            is_valid, validation_info = self._cached_validate(self.current_license)
             if not is_valid:
                 self.console.print(f"[red]License validation failed: {validation_info['reason']}[/red]")
                 return None
         
         try:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=self.console,
-                transient=True
-            ) as progress:
-                
-                task = progress.add_task("Processing query...", total=None)
-                start_time = time.time()
-                
-                result = self.pipeline.query(query)
-                
-                processing_time = time.time() - start_time
-                progress.update(task, description=f"Query processed in {processing_time:.2f}s")
-            
+            start_time = time.time()
+
+            result = self._run_with_spinner(
+                "Processing query...", lambda: self.pipeline.query(query)
+            )
+
+            processing_time = time.time() - start_time
+
             # Record usage
             if self.current_license:
                 self.license_validator.record_query_usage(
@@ -302,6 +383,8 @@ knowledge base and provide an answer with source citations.
                     response_length=len(result.answer),
                     processing_time=processing_time
                 )
+                # Usage counters changed; force re-validation next time
+                self._license_cache.pop(self.current_license, None)
             
             return result
             
@@ -311,6 +394,9 @@ knowledge base and provide an answer with source citations.
     
     def display_result(self, result) -> None:
         """Display query result."""
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+
         # Show answer
         self.console.print(Panel(
             Markdown(result.answer),
@@ -332,6 +418,9 @@ knowledge base and provide an answer with source citations.
     
     def show_sources(self) -> None:
         """Show detailed sources from last query."""
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+
         if not hasattr(self, 'last_result') or not self.last_result:
             self.console.print("[yellow]No previous query results[/yellow]")
             return
@@ -355,15 +444,25 @@ knowledge base and provide an answer with source citations.
     
     def run_interactive(self) -> None:
         """Run the interactive CLI."""
+        from rich.prompt import Confirm, Prompt
+
         if not self.setup():
             return
-        
-        if not self.check_license():
-            return
-        
-        if not self.initialize_pipeline():
+
+        # License validation and pipeline initialization are independent, so
+        # run them concurrently: model loading dominates startup and now
+        # overlaps with the license check instead of waiting behind it
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            license_future = executor.submit(self.check_license)
+            pipeline_future = executor.submit(self.initialize_pipeline)
+            license_ok = license_future.result()
+            pipeline_ok = pipeline_future.result()
+
+        if not license_ok or not pipeline_ok:
             return
-        
+
         self.show_welcome()
         
         try:
@@ -421,11 +520,14 @@ knowledge base and provide an answer with source citations.
 @click.option('--license', '-l', help='Path to license file')
 def main(config: Optional[str] = None, query: Optional[str] = None, license: Optional[str] = None):
     """Local RAG Assistant - Command Line Interface."""
-    
-    cli = RAGAssistantCLI()
-    
+
+    # click handles --help/-h and argument errors before this callback runs,
+    # so the Console and signal handlers in RAGAssistantCLI are only set up
+    # once we know real work is about to happen.
     if query:
         # Single query mode
+        cli = RAGAssistantCLI()
+
         if not cli.setup():
             sys.exit(1)
         
@@ -442,6 +544,7 @@ def main(config: Optional[str] = None, query: Optional[str] = None, license: Opt
             sys.exit(1)
     else:
         # Interactive mode
+        cli = RAGAssistantCLI()
         cli.run_interactive()
 
 
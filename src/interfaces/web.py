@@ -1,15 +1,22 @@
 """Streamlit web interface for Local RAG Assistant."""
 
 import streamlit as st
-import sys
-from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from src.core.pipeline import RAGPipeline
-from src.utils.config import load_config
-from src.utils.logging import setup_logging
+@st.cache_resource
+def _get_pipeline():
+    """Load the RAG pipeline once per process, shared across all sessions."""
+    # Streamlit re-executes this script top-to-bottom on every widget
+    # interaction; importing the pipeline stack (torch, sentence-
+    # transformers) here keeps reruns to just the streamlit import, since
+    # the cached resource means this body runs once per process
+    from src.core.pipeline import RAGPipeline
+    from src.utils.config import load_config
+
+    config = load_config()
+    pipeline = RAGPipeline(config)
+    pipeline.initialize()
+    return pipeline
 
 
 def main():
@@ -19,21 +26,18 @@ def main():
         page_icon="🤖",
         layout="wide"
     )
-    
+
     st.title("🤖 Local RAG Assistant")
-    st.subtitle("Offline Document Q&A System")
-    
-    # Initialize pipeline
-    if "pipeline" not in st.session_state:
-        try:
-            config = load_config()
-            st.session_state.pipeline = RAGPipeline(config)
-            st.session_state.pipeline.initialize_pipeline()
-            st.success("✅ RAG Pipeline initialized successfully!")
-        except Exception as e:
-            st.error(f"❌ Failed to initialize pipeline: {e}")
-            st.stop()
-    
+    st.caption("Offline Document Q&A System")
+
+    # Initialize pipeline; cache_resource keeps one instance per process,
+    # so new browser sessions don't reload the models
+    try:
+        pipeline = _get_pipeline()
+    except Exception as e:
+        st.error(f"❌ Failed to initialize pipeline: {e}")
+        st.stop()
+
     # Chat interface
     st.header("💬 Ask Questions")
     
@@ -43,20 +47,20 @@ def main():
     if st.button("🔍 Search") and query:
         with st.spinner("Searching documents..."):
             try:
-                response = st.session_state.pipeline.query(query)
-                
+                response = pipeline.query(query)
+
                 st.subheader("📝 Answer")
-                st.write(response.get("answer", "No answer generated"))
-                
-                if "sources" in response and response["sources"]:
+                st.write(response.answer or "No answer generated")
+
+                if response.sources:
                     st.subheader("📚 Sources")
-                    for i, source in enumerate(response["sources"], 1):
+                    for i, source in enumerate(response.sources, 1):
                         with st.expander(f"Source {i}: {source.get('title', 'Unknown')}"):
                             st.write(f"**Path:** {source.get('path', 'N/A')}")
                             st.write(f"**Score:** {source.get('score', 0):.3f}")
-                            if 'content' in source:
+                            if 'content_preview' in source:
                                 st.write("**Content:**")
-                                st.write(source['content'])
+                                st.write(source['content_preview'])
                 
             except Exception as e:
                 st.error(f"❌ Error processing query: {e}")
@@ -65,8 +69,7 @@ def main():
     with st.sidebar:
         st.header("📊 Statistics")
         try:
-            retriever = st.session_state.pipeline.retriever
-            doc_count = retriever.get_document_count()
+            doc_count = pipeline.retriever.get_document_count()
             st.metric("Documents Indexed", doc_count)
         except:
             st.metric("Documents Indexed", "N/A")
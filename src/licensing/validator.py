@@ -1,18 +1,72 @@
 """License validation functionality for Local RAG Assistant."""
 
+import atexit
+import functools
+import hashlib
+import hmac
 import json
+import os
+import threading
 import time
 import sqlite3
+from collections import deque
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding
 import base64
 
+# cryptography is imported lazily inside the verification path: its
+# hazmat layer costs ~100ms+ to import and signature caching means most
+# validations never touch it after the first
+
 from ..utils.config import Configuration
 from ..utils.logging import get_logger
 from ..utils.helpers import ensure_directory
 
+try:
+    import orjson  # Optional: C-backed JSON, faster token decoding
+except ImportError:
+    orjson = None
+
+# How long a verified signature may be trusted before re-running RSA
+_SIGNATURE_CACHE_TTL = 300.0
+
+# Pending usage records are flushed after this many entries or on the
+# background flusher's next wakeup, whichever comes first
+_USAGE_FLUSH_BATCH = 128
+_USAGE_FLUSH_INTERVAL = 1.0
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=32)
+def _decode_token(token: str) -> Tuple[bytes, Dict[str, Any], str]:
+    """
+    Split a token into (signed_bytes, license_data, signature_b64).
+
+    Tokens are immutable, so the base64 + JSON decode work is memoized;
+    signature verification still runs per validation.
+    """
+    token_json = base64.b64decode(token.encode('utf-8'))
+    license_token = _json_loads(token_json)
+
+    if 'data_b64' in license_token:
+        # Current layout: the exact signed bytes are embedded, so
+        # verification needs no re-canonicalization
+        signed_bytes = base64.b64decode(license_token['data_b64'])
+        return signed_bytes, _json_loads(signed_bytes), license_token.get('sig', '')
+
+    # Legacy layout: data dict embedded inline; must byte-match what the
+    # old issuer signed, so keep stdlib json here (orjson's compact
+    # separators would not verify)
+    license_data = license_token.get('data', {})
+    signed_bytes = json.dumps(license_data, sort_keys=True).encode('utf-8')
+    return signed_bytes, license_data, license_token.get('signature', '')
+
 
 class LicenseValidator:
     """Validates RSA-based license keys for the RAG assistant."""
@@ -28,19 +82,61 @@ class LicenseValidator:
         self.logger = get_logger(__name__)
         self.licenses_dir = config.paths.licenses
         self.usage_db_path = self.licenses_dir / "usage.db"
-        
+        # Parsed public key cache plus verified-signature results; RSA
+        # verification dominates validate_license and tokens are immutable
+        self._public_key = None
+        self._public_key_mtime: Optional[int] = None
+        # Cache entries are keyed by a keyed MAC of the token under a
+        # per-process random key, so a cached "valid" verdict can't be
+        # reached without knowing this session's key; HMAC-SHA256 is
+        # orders of magnitude cheaper than the RSA verify it replaces
+        self._session_key = os.urandom(32)
+        self._signature_cache: Dict[bytes, Tuple[float, bool]] = {}
+        self._signature_lock = threading.Lock()
+        self._token_hash_cache: Dict[str, bytes] = {}
+
+        # One connection per thread, reused for the validator's lifetime;
+        # per-call connect/close dominated the cheap point lookups
+        self._conn_tls = threading.local()
+
+        # Usage records are buffered in memory and group-committed by a
+        # background thread, so the query path never waits on an fsync
+        self._pending: deque = deque()
+        self._pending_counts: Dict[bytes, int] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        atexit.register(self.flush)
+
         ensure_directory(self.licenses_dir)
         self._initialize_usage_db()
     
+    def _conn(self) -> sqlite3.Connection:
+        """
+        Return this thread's usage-db connection, creating it on first use.
+
+        WAL mode lets stats reads proceed concurrently with usage writes,
+        and synchronous=NORMAL is safe there (a crash can lose the last
+        transaction but not corrupt the database).
+        """
+        conn = getattr(self._conn_tls, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.usage_db_path), cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn_tls.conn = conn
+        return conn
+
     def _initialize_usage_db(self) -> None:
         """Initialize the usage tracking database."""
         try:
-            conn = sqlite3.connect(str(self.usage_db_path))
+            conn = self._conn()
             cursor = conn.cursor()
             
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS license_usage (
-                    license_hash TEXT PRIMARY KEY,
+                    license_hash BLOB PRIMARY KEY,
                     plan TEXT NOT NULL,
                     user_id TEXT,
                     first_used TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -54,7 +150,7 @@ class LicenseValidator:
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS query_log (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    license_hash TEXT NOT NULL,
+                    license_hash BLOB NOT NULL,
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     query_length INTEGER,
                     response_length INTEGER,
@@ -62,10 +158,20 @@ class LicenseValidator:
                     FOREIGN KEY (license_hash) REFERENCES license_usage(license_hash)
                 )
             """)
-            
+
+            # Composite index serves get_license_usage's 7-day aggregate;
+            # the timestamp index serves cleanup's range delete
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_qlog_lh_ts
+                ON query_log(license_hash, timestamp)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_qlog_ts
+                ON query_log(timestamp)
+            """)
+
             conn.commit()
-            conn.close()
-            
+
         except Exception as e:
             self.logger.error(f"Failed to initialize usage database: {e}")
             raise
@@ -91,27 +197,25 @@ class LicenseValidator:
         }
         
         try:
-            # Decode the token
+            # Decode the token (memoized; tokens are immutable)
             try:
-                token_json = base64.b64decode(token.encode('utf-8'))
-                license_token = json.loads(token_json)
+                signed_bytes, license_data, signature_b64 = _decode_token(token)
             except Exception as e:
                 validation_info['reason'] = f"Invalid token format: {e}"
                 return False, validation_info
-            
-            # Extract data and signature
-            license_data = license_token.get('data', {})
-            signature_b64 = license_token.get('signature', '')
-            
+
             if not license_data or not signature_b64:
                 validation_info['reason'] = "Missing license data or signature"
                 return False, validation_info
-            
+
             validation_info['data'] = license_data
             validation_info['plan'] = license_data.get('plan', 'unknown')
-            
-            # Verify signature
-            signature_valid = self._verify_signature(license_data, signature_b64)
+
+            # Verify signature (cached per token; expiry and usage limits
+            # below are still checked on every call)
+            signature_valid = self._verify_signature_cached(
+                token, signed_bytes, signature_b64
+            )
             validation_info['signature_valid'] = signature_valid
             
             if not signature_valid:
@@ -146,40 +250,87 @@ class LicenseValidator:
             self.logger.error(f"License validation failed: {e}")
             return False, validation_info
     
-    def _verify_signature(self, license_data: Dict[str, Any], signature_b64: str) -> bool:
+    def _load_public_key(self):
+        """
+        Load the public key, reusing the parsed object across calls.
+
+        Re-parses only when the file's mtime changes (e.g. after key
+        regeneration), so repeat validations skip the PEM read and parse.
+
+        Returns:
+            Loaded public key object, or None if the key file is missing.
+        """
+        public_key_path = self.licenses_dir / "public_key.pem"
+        try:
+            mtime = public_key_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        if self._public_key is None or mtime != self._public_key_mtime:
+            from cryptography.hazmat.primitives import serialization
+
+            with open(public_key_path, 'rb') as f:
+                self._public_key = serialization.load_pem_public_key(f.read())
+            self._public_key_mtime = mtime
+
+        return self._public_key
+
+    def _verify_signature_cached(self, token: str, signed_bytes: bytes,
+                                 signature_b64: str) -> bool:
+        """
+        Verify a signature, reusing a recent result for the same token.
+
+        Tokens are immutable, so a successful RSA verification can be
+        trusted for a short window; feature checks on the query path then
+        cost one HMAC-SHA256 (SHA-NI-backed) instead of ~1ms of RSA work.
+        """
+        tag = hmac.new(self._session_key, token.encode('utf-8'), 'sha256').digest()
+        now = time.monotonic()
+        with self._signature_lock:
+            entry = self._signature_cache.get(tag)
+            if entry is not None and now < entry[0]:
+                return entry[1]
+
+        valid = self._verify_signature(signed_bytes, signature_b64)
+
+        with self._signature_lock:
+            self._signature_cache[tag] = (now + _SIGNATURE_CACHE_TTL, valid)
+        return valid
+
+    def _verify_signature(self, signed_bytes: bytes, signature_b64: str) -> bool:
         """
         Verify the license signature.
-        
+
         Args:
-            license_data: License data dictionary.
+            signed_bytes: The exact bytes that were signed.
             signature_b64: Base64-encoded signature.
-            
+
         Returns:
             True if signature is valid, False otherwise.
         """
         try:
-            # Load public key
-            public_key_path = self.licenses_dir / "public_key.pem"
-            if not public_key_path.exists():
+            from cryptography.hazmat.primitives import hashes
+            from cryptography.hazmat.primitives.asymmetric import ed25519, padding
+
+            # Load public key (parsed once and cached)
+            public_key = self._load_public_key()
+            if public_key is None:
                 self.logger.error("Public key not found")
                 return False
-            
-            with open(public_key_path, 'rb') as f:
-                public_key = serialization.load_pem_public_key(f.read())
-            
-            # Recreate the signed data
-            license_json = json.dumps(license_data, sort_keys=True).encode('utf-8')
-            
+
             # Decode signature
             signature = base64.b64decode(signature_b64.encode('utf-8'))
-            
-            # Verify signature
-            public_key.verify(
-                signature,
-                license_json,
-                padding.PKCS1v15(),
-                hashes.SHA256()
-            )
+
+            # Verify signature; dispatch on the key type loaded from disk
+            if isinstance(public_key, ed25519.Ed25519PublicKey):
+                public_key.verify(signature, signed_bytes)
+            else:
+                public_key.verify(
+                    signature,
+                    signed_bytes,
+                    padding.PKCS1v15(),
+                    hashes.SHA256()
+                )
             
             return True
             
@@ -187,6 +338,22 @@ class LicenseValidator:
             self.logger.debug(f"Signature verification failed: {e}")
             return False
     
+    def _license_hash(self, token: str) -> bytes:
+        """
+        Stable 16-byte usage-tracking key for a license token.
+
+        Python's hash() is salted per process, so the previous
+        str(hash(token)) key changed on every restart — usage counters
+        silently reset and dead rows accumulated. BLAKE2b-128 is stable
+        across processes and a fixed-width blob indexes faster than
+        variable-length text.
+        """
+        cached = self._token_hash_cache.get(token)
+        if cached is None:
+            cached = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+            self._token_hash_cache[token] = cached
+        return cached
+
     def _check_usage_limits(self, token: str, license_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Check if license usage is within limits.
@@ -207,51 +374,72 @@ class LicenseValidator:
         
         try:
             # Get license hash for tracking
-            license_hash = str(hash(token))
+            license_hash = self._license_hash(token)
             max_queries_per_day = license_data.get('max_queries_per_day', 1000)
-            
-            conn = sqlite3.connect(str(self.usage_db_path))
+
+            conn = self._conn()
             cursor = conn.cursor()
-            
-            # Get or create usage record
-            cursor.execute("""
-                SELECT daily_queries, last_reset_date 
-                FROM license_usage 
-                WHERE license_hash = ?
-            """, (license_hash,))
-            
-            row = cursor.fetchone()
             current_date = time.strftime('%Y-%m-%d')
-            
-            if row:
-                daily_queries, last_reset_date = row
-                
-                # Reset daily counter if it's a new day
-                if last_reset_date != current_date:
-                    cursor.execute("""
-                        UPDATE license_usage 
-                        SET daily_queries = 0, last_reset_date = ? 
-                        WHERE license_hash = ?
-                    """, (current_date, license_hash))
-                    daily_queries = 0
-                    
-            else:
-                # Create new usage record
+
+            try:
+                # Get-or-create and daily reset in one atomic statement:
+                # one B-tree descent, no read-modify-write race
                 cursor.execute("""
-                    INSERT INTO license_usage 
+                    INSERT INTO license_usage
                     (license_hash, plan, user_id, daily_queries, last_reset_date)
                     VALUES (?, ?, ?, 0, ?)
+                    ON CONFLICT(license_hash) DO UPDATE SET
+                        daily_queries = CASE
+                            WHEN last_reset_date != excluded.last_reset_date THEN 0
+                            ELSE daily_queries
+                        END,
+                        last_reset_date = excluded.last_reset_date
+                    RETURNING daily_queries
                 """, (
                     license_hash,
                     license_data.get('plan', 'unknown'),
                     license_data.get('user_id', 'unknown'),
                     current_date
                 ))
-                daily_queries = 0
-            
+                daily_queries = cursor.fetchone()[0]
+            except sqlite3.OperationalError:
+                # RETURNING needs SQLite >= 3.35; fall back to the
+                # classic select-then-update-or-insert flow
+                cursor.execute("""
+                    SELECT daily_queries, last_reset_date
+                    FROM license_usage
+                    WHERE license_hash = ?
+                """, (license_hash,))
+                row = cursor.fetchone()
+
+                if row:
+                    daily_queries, last_reset_date = row
+                    if last_reset_date != current_date:
+                        cursor.execute("""
+                            UPDATE license_usage
+                            SET daily_queries = 0, last_reset_date = ?
+                            WHERE license_hash = ?
+                        """, (current_date, license_hash))
+                        daily_queries = 0
+                else:
+                    cursor.execute("""
+                        INSERT INTO license_usage
+                        (license_hash, plan, user_id, daily_queries, last_reset_date)
+                        VALUES (?, ?, ?, 0, ?)
+                    """, (
+                        license_hash,
+                        license_data.get('plan', 'unknown'),
+                        license_data.get('user_id', 'unknown'),
+                        current_date
+                    ))
+                    daily_queries = 0
+
             conn.commit()
-            conn.close()
-            
+
+            # Include records still buffered for the background flusher
+            with self._pending_lock:
+                daily_queries += self._pending_counts.get(license_hash, 0)
+
             # Check limits
             result['daily_queries_used'] = daily_queries
             result['remaining_queries'] = max(0, max_queries_per_day - daily_queries)
@@ -288,35 +476,74 @@ class LicenseValidator:
             True if recorded successfully, False otherwise.
         """
         try:
-            license_hash = str(hash(token))
-            
-            conn = sqlite3.connect(str(self.usage_db_path))
+            license_hash = self._license_hash(token)
+
+            # Buffer the record; the background flusher group-commits so
+            # the query path costs a deque append instead of an fsync
+            with self._pending_lock:
+                self._pending.append(
+                    (license_hash, query_length, response_length, processing_time)
+                )
+                self._pending_counts[license_hash] = \
+                    self._pending_counts.get(license_hash, 0) + 1
+                backlog = len(self._pending)
+
+            self._ensure_flush_thread()
+            if backlog >= _USAGE_FLUSH_BATCH:
+                self._flush_event.set()
+
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to record query usage: {e}")
+            return False
+
+    def _ensure_flush_thread(self) -> None:
+        """Start the background usage flusher if it isn't running."""
+        if self._flush_thread is None or not self._flush_thread.is_alive():
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop, name="usage-flush", daemon=True
+            )
+            self._flush_thread.start()
+
+    def _flush_loop(self) -> None:
+        """Flush pending usage records every interval or when nudged."""
+        while True:
+            self._flush_event.wait(timeout=_USAGE_FLUSH_INTERVAL)
+            self._flush_event.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered usage records in one transaction."""
+        with self._pending_lock:
+            if not self._pending:
+                return
+            batch = list(self._pending)
+            self._pending.clear()
+            self._pending_counts.clear()
+
+        try:
+            conn = self._conn()
             cursor = conn.cursor()
-            
-            # Update usage counters
-            cursor.execute("""
-                UPDATE license_usage 
+
+            cursor.executemany("""
+                UPDATE license_usage
                 SET total_queries = total_queries + 1,
                     daily_queries = daily_queries + 1,
                     last_used = CURRENT_TIMESTAMP
                 WHERE license_hash = ?
-            """, (license_hash,))
-            
-            # Record detailed query log
-            cursor.execute("""
-                INSERT INTO query_log 
+            """, [(record[0],) for record in batch])
+
+            cursor.executemany("""
+                INSERT INTO query_log
                 (license_hash, query_length, response_length, processing_time)
                 VALUES (?, ?, ?, ?)
-            """, (license_hash, query_length, response_length, processing_time))
-            
+            """, batch)
+
             conn.commit()
-            conn.close()
-            
-            return True
-            
+
         except Exception as e:
-            self.logger.error(f"Failed to record query usage: {e}")
-            return False
+            self.logger.error(f"Failed to flush query usage: {e}")
     
     def get_license_usage(self, token: str) -> Dict[str, Any]:
         """
@@ -329,11 +556,14 @@ class LicenseValidator:
             Dictionary with usage statistics.
         """
         try:
-            license_hash = str(hash(token))
-            
-            conn = sqlite3.connect(str(self.usage_db_path))
+            # Push buffered records out first so the stats are current
+            self.flush()
+
+            license_hash = self._license_hash(token)
+
+            conn = self._conn()
             cursor = conn.cursor()
-            
+
             # Get basic usage info
             cursor.execute("""
                 SELECT plan, user_id, first_used, last_used, 
@@ -343,9 +573,8 @@ class LicenseValidator:
             """, (license_hash,))
             
             row = cursor.fetchone()
-            
+
             if not row:
-                conn.close()
                 return {'exists': False}
             
             # Get recent query activity
@@ -358,8 +587,7 @@ class LicenseValidator:
             """, (license_hash,))
             
             activity_row = cursor.fetchone()
-            conn.close()
-            
+
             return {
                 'exists': True,
                 'plan': row[0],
@@ -449,20 +677,22 @@ class LicenseValidator:
             Number of records deleted.
         """
         try:
-            conn = sqlite3.connect(str(self.usage_db_path))
+            self.flush()
+
+            conn = self._conn()
             cursor = conn.cursor()
-            
-            # Delete old query logs
+
+            # Delete old query logs; the modifier is bound as a parameter so
+            # the statement text stays constant and reuses its cached plan
             cursor.execute("""
-                DELETE FROM query_log 
-                WHERE timestamp < datetime('now', '-{} days')
-            """.format(days_to_keep))
+                DELETE FROM query_log
+                WHERE timestamp < datetime('now', ?)
+            """, (f'-{days_to_keep} days',))
             
             deleted_count = cursor.rowcount
-            
+
             conn.commit()
-            conn.close()
-            
+
             self.logger.info(f"Cleaned up {deleted_count} old usage records")
             return deleted_count
             
@@ -1,13 +1,44 @@
 """Configuration management for Local RAG Assistant."""
 
-import os
-import yaml
+import functools
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
 
-@dataclass
+@functools.lru_cache(maxsize=4)
+def _read_yaml(path: str) -> Dict[str, Any]:
+    """Parse a YAML file, caching the result per path."""
+    # Both parsers are imported here rather than at module scope so
+    # processes that never parse a config (e.g. `--help`) skip the
+    # import; the lru_cache means the cost is paid once at most anyway.
+    # msgspec's hand-written C decoder is preferred when installed and
+    # avoids importing PyYAML entirely
+    try:
+        import msgspec.yaml
+        return msgspec.yaml.decode(Path(path).read_bytes())
+    except ImportError:
+        pass
+
+    # CSafeLoader is the LibYAML-backed loader (~10x faster) when PyYAML
+    # was built with it
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _resolve_config_path(candidates: tuple, description: str) -> str:
+    """Return the first existing candidate path, or raise."""
+    for candidate in candidates:
+        if Path(candidate).is_file():
+            return candidate
+    raise FileNotFoundError(
+        f"{description} not found. Expected at {candidates[0]}"
+    )
+
+
+@dataclass(slots=True, frozen=True)
 class AppConfig:
     """Application configuration."""
     name: str
@@ -16,7 +47,7 @@ class AppConfig:
     log_level: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PathConfig:
     """Path configuration."""
     models: Path
@@ -25,16 +56,9 @@ class PathConfig:
     logs: Path
     licenses: Path
     config: Path
-    
-    def __post_init__(self):
-        """Convert string paths to Path objects."""
-        for field_name in self.__dataclass_fields__:
-            value = getattr(self, field_name)
-            if isinstance(value, str):
-                setattr(self, field_name, Path(value))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EmbeddingConfig:
     """Embedding model configuration."""
     model_name: str
@@ -42,9 +66,12 @@ class EmbeddingConfig:
     batch_size: int
     max_length: int
     normalize_embeddings: bool
+    precision: str = "float32"  # "float32" or "float16" (float16 assumes normalized cosine)
+    backend: str = "torch"  # "torch" or "onnx" (requires optimum[onnxruntime])
+    ingest_batch_size: int = 64  # Documents embedded per batch during bulk ingest
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentConfig:
     """Document processing configuration."""
     supported_formats: list
@@ -54,16 +81,20 @@ class DocumentConfig:
     max_chunks_per_doc: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VectorDBConfig:
     """Vector database configuration."""
     index_type: str
     use_gpu: bool
     nprobe: int
     save_interval: int
+    nlist: int = 1024  # IVF cluster count (rule of thumb: ~4*sqrt(N))
+    pq_m: int = 16  # PQ sub-quantizers; must divide the embedding dimension
+    pq_nbits: int = 8  # Bits per PQ code
+    quantization: str = "none"  # "none" or "sq8" (8-bit scalar codes, 4x smaller)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LLMConfig:
     """Language model configuration."""
     model_path: str
@@ -73,10 +104,12 @@ class LLMConfig:
     top_p: float
     top_k: int
     repeat_penalty: float
-    threads: int
+    threads: int  # <= 0 auto-detects physical cores (capped at 16)
+    n_gpu_layers: int = 0  # Layers to offload to Metal/CUDA builds
+    use_mlock: Optional[bool] = None  # None = auto (mlock when RAM comfortably fits the model)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RAGConfig:
     """RAG pipeline configuration."""
     retrieval_k: int
@@ -85,9 +118,10 @@ class RAGConfig:
     min_similarity: float
     max_context_length: int
     include_sources: bool
+    async_prefill: bool = False  # Prefill the system prompt while retrieval runs
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Configuration:
     """Main configuration class."""
     app: AppConfig
@@ -122,18 +156,18 @@ def load_config(config_path: Optional[str] = None) -> Configuration:
     """
     if config_path is None:
         # Look for config in current directory or parent
-        config_path = "config/settings.yaml"
-        if not os.path.exists(config_path):
-            config_path = "../config/settings.yaml"
-            if not os.path.exists(config_path):
-                raise FileNotFoundError("Configuration file not found. Expected at config/settings.yaml")
-    
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config_data = yaml.safe_load(f)
-    
-    # Create configuration objects
+        config_path = _resolve_config_path(
+            ("config/settings.yaml", "../config/settings.yaml"),
+            "Configuration file"
+        )
+
+    config_data = _read_yaml(str(config_path))
+
+    # Create configuration objects; paths are converted here so
+    # PathConfig needs no reflection-heavy __post_init__ (which also
+    # lets the dataclasses above be frozen with slots)
     app_config = AppConfig(**config_data['app'])
-    path_config = PathConfig(**config_data['paths'])
+    path_config = PathConfig(**{k: Path(v) for k, v in config_data['paths'].items()})
     embedding_config = EmbeddingConfig(**config_data['embedding'])
     document_config = DocumentConfig(**config_data['document_processing'])
     vector_db_config = VectorDBConfig(**config_data['vector_db'])
@@ -169,12 +203,12 @@ def load_model_config(model_config_path: Optional[str] = None) -> Dict[str, Any]
         Dictionary containing model configurations.
     """
     if model_config_path is None:
-        model_config_path = "config/models.yaml"
-        if not os.path.exists(model_config_path):
-            model_config_path = "../config/models.yaml"
-    
-    with open(model_config_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        model_config_path = _resolve_config_path(
+            ("config/models.yaml", "../config/models.yaml"),
+            "Model configuration file"
+        )
+
+    return _read_yaml(str(model_config_path))
 
 
 def ensure_directories(config: Configuration) -> None:
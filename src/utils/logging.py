@@ -1,11 +1,123 @@
 """Logging configuration for Local RAG Assistant."""
 
+import atexit
+import functools
 import logging
 import logging.handlers
 import os
+import queue
+import re
+import sys
 from pathlib import Path
 from typing import Optional
 
+# File-handler stream buffer; large enough that debug-heavy runs batch
+# dozens of records per write() syscall
+_LOG_BUFFER_SIZE = 131072
+
+
+class _BufferedFlushMixin:
+    """Skip the per-record flush for records below WARNING.
+
+    The stock handlers flush after every record, costing one write()
+    syscall per log line. With this mixin INFO/DEBUG records accumulate
+    in the stream's buffer and reach the disk in large batches, while
+    WARNING and above still flush immediately so problems are on disk
+    before a potential crash. logging.shutdown() flushes the remainder
+    at interpreter exit.
+    """
+
+    _flush_now = True
+
+    def _open(self):
+        return open(self.baseFilename, self.mode,
+                    buffering=_LOG_BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._flush_now = record.levelno >= logging.WARNING
+        try:
+            super().emit(record)
+        finally:
+            self._flush_now = True
+
+    def flush(self) -> None:
+        if self._flush_now:
+            super().flush()
+
+
+class BufferedFileHandler(_BufferedFlushMixin, logging.FileHandler):
+    """FileHandler with batched writes for low-severity records."""
+
+
+class BufferedRotatingFileHandler(_BufferedFlushMixin,
+                                  logging.handlers.RotatingFileHandler):
+    """Size-rotating handler with batched writes for low-severity records."""
+
+
+class BufferedTimedRotatingFileHandler(_BufferedFlushMixin,
+                                       logging.handlers.TimedRotatingFileHandler):
+    """Time-rotating handler with batched writes for low-severity records."""
+
+
+# Size strings parse in one regex pass plus a multiplier lookup instead
+# of an endswith/slice chain
+_SIZE_RE = re.compile(r'\s*(\d+)\s*([KMG]B|B)?\s*')
+_SIZE_MULT = {None: 1, 'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3}
+
+# Formatters keyed by format string; re-entrant setup_logging calls
+# reuse the compiled PercentStyle state instead of re-parsing it
+_FORMATTER_CACHE: dict = {}
+
+
+def _stop_listener(listener: logging.handlers.QueueListener) -> None:
+    """Stop a queue listener, tolerating one that is already stopped."""
+    if getattr(listener, '_thread', None) is not None:
+        listener.stop()
+
+
+class BatchedStreamHandler(_BufferedFlushMixin, logging.StreamHandler):
+    """Console handler that relies on line buffering instead of flushing.
+
+    Each record ends in a newline, so with the stream reconfigured to
+    line_buffering=True the write itself triggers the flush; the stock
+    per-record flush() call would just repeat the syscall. WARNING and
+    above still flush explicitly via the mixin.
+    """
+
+
+class CachedFormatter(logging.Formatter):
+    """Formatter that interpolates a record's message at most once.
+
+    With both a console and a file handler attached, the stock Formatter
+    calls record.getMessage() once per handler, re-running %-style arg
+    interpolation (and any expensive __str__ on the args) on the same
+    record. Handlers share the record instance, so the first format()
+    caches the rendered message and the second handler reuses it.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        cached = getattr(record, '_cached_message', None)
+        if cached is None:
+            cached = record.getMessage()
+            record._cached_message = cached
+        record.message = cached
+        if self.usesTime():
+            record.asctime = self.formatTime(record, self.datefmt)
+        s = self.formatMessage(record)
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + record.exc_text
+        if record.stack_info:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + self.formatStack(record.stack_info)
+        return s
+
 
 def setup_logging(
     log_level: str = "INFO",
@@ -29,24 +141,42 @@ def setup_logging(
     Returns:
         Configured logger instance.
     """
+    # Resolve the level once for the logger and both handlers
+    level = getattr(logging, log_level.upper(), logging.INFO)
+
     # Create logger
     logger = logging.getLogger("local_rag_assistant")
-    logger.setLevel(getattr(logging, log_level.upper()))
-    
-    # Clear any existing handlers
+    logger.setLevel(level)
+
+    # Clear any existing handlers, draining a previous listener's queue
+    # first so its worker thread doesn't leak across reconfigurations
+    old_listener = getattr(logger, '_listener', None)
+    if old_listener is not None:
+        _stop_listener(old_listener)
+        logger._listener = None
     logger.handlers.clear()
     
     # Default format
     if log_format is None:
         log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
-    formatter = logging.Formatter(log_format)
+    formatter = _FORMATTER_CACHE.get(log_format)
+    if formatter is None:
+        formatter = _FORMATTER_CACHE[log_format] = CachedFormatter(log_format)
     
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, log_level.upper()))
+    # Console handler; stdout is switched to line buffering so each
+    # record's newline flushes it, letting the handler skip its own
+    # per-record flush (a win when stdout is redirected to a file)
+    try:
+        sys.stdout.reconfigure(line_buffering=True)
+    except (AttributeError, ValueError):
+        # Non-reconfigurable replacement stream (e.g. under capture)
+        pass
+    atexit.register(sys.stdout.flush)
+    console_handler = BatchedStreamHandler(sys.stdout)
+    console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler (if specified)
     if log_file:
@@ -54,7 +184,7 @@ def setup_logging(
         Path(log_file).parent.mkdir(parents=True, exist_ok=True)
         
         if file_rotation == "midnight":
-            file_handler = logging.handlers.TimedRotatingFileHandler(
+            file_handler = BufferedTimedRotatingFileHandler(
                 log_file,
                 when='midnight',
                 interval=1,
@@ -64,43 +194,53 @@ def setup_logging(
         elif file_rotation == "size":
             # Convert size string to bytes
             size_bytes = _parse_size(max_file_size)
-            file_handler = logging.handlers.RotatingFileHandler(
+            file_handler = BufferedRotatingFileHandler(
                 log_file,
                 maxBytes=size_bytes,
                 backupCount=backup_count,
                 encoding='utf-8'
             )
         else:
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler = BufferedFileHandler(log_file, encoding='utf-8')
         
-        file_handler.setLevel(getattr(logging, log_level.upper()))
+        file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
+        handlers.append(file_handler)
+
+    # The real handlers run behind a queue listener on a background
+    # thread, so a log call on the hot path costs one queue put instead
+    # of blocking on console and file writes
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger._listener = listener
+    atexit.register(_stop_listener, listener)
+
     return logger
 
 
+@functools.lru_cache(maxsize=32)
 def _parse_size(size_str: str) -> int:
     """
-    Parse size string to bytes.
-    
+    Parse size string to bytes; results are memoized per distinct string.
+
     Args:
         size_str: Size string like '10MB', '1GB', etc.
-        
+
     Returns:
         Size in bytes.
+
+    Raises:
+        ValueError: If the string isn't a number with an optional
+            B/KB/MB/GB suffix.
     """
-    size_str = size_str.upper().strip()
-    
-    if size_str.endswith('KB'):
-        return int(size_str[:-2]) * 1024
-    elif size_str.endswith('MB'):
-        return int(size_str[:-2]) * 1024 * 1024
-    elif size_str.endswith('GB'):
-        return int(size_str[:-2]) * 1024 * 1024 * 1024
-    else:
-        # Assume bytes
-        return int(size_str)
+    match = _SIZE_RE.fullmatch(size_str.upper())
+    if match is None:
+        raise ValueError(f"Invalid size string: {size_str!r}")
+    return int(match.group(1)) * _SIZE_MULT[match.group(2)]
 
 
 def get_logger(name: str = "local_rag_assistant") -> logging.Logger:
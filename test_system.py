@@ -7,85 +7,118 @@ from pathlib import Path
 # Add src to path
 sys.path.append(str(Path(__file__).parent))
 
-from src.data.loader import DocumentLoader
-from src.utils.config import load_config, ensure_directories
-from src.utils.logging import setup_logging
+
+def _flush(out):
+    """Emit buffered lines as a single stdout write."""
+    if out:
+        sys.stdout.write('\n'.join(out) + '\n')
+        out.clear()
 
 
 def test_system():
     """Test the system functionality."""
-    print("🔧 Testing Local RAG Assistant System-Wide Scanning")
-    print("=" * 60)
-    
+    # Output is collected per section and written in one syscall each,
+    # instead of one write per print()
+    out = []
+    logger = None
+    out.append("🔧 Testing Local RAG Assistant System-Wide Scanning")
+    out.append("=" * 60)
+
     try:
+        # Imported here rather than at module top: these pull in the
+        # embedding/LLM stack transitively, and the banner should print
+        # before that startup cost is paid
+        from src.data.loader import DocumentLoader
+        from src.utils.config import load_config, ensure_directories
+        from src.utils.logging import setup_logging
+
         # Load configuration
-        print("1. Loading configuration...")
+        out.append("1. Loading configuration...")
         config = load_config()
         ensure_directories(config)
-        print("   ✓ Configuration loaded successfully")
-        
+        out.append("   ✓ Configuration loaded successfully")
+
         # Setup logging
-        print("2. Setting up logging...")
-        setup_logging(
+        out.append("2. Setting up logging...")
+        logger = setup_logging(
             log_level=config.app.log_level,
             log_file=str(config.paths.logs / "test.log")
         )
-        print("   ✓ Logging configured")
-        
+        out.append("   ✓ Logging configured")
+
         # Test document loader
-        print("3. Testing document scanner...")
+        out.append("3. Testing document scanner...")
         loader = DocumentLoader(config)
-        print(f"   ✓ Scanner initialized (sudo: {loader.is_sudo})")
-        
-        # Test home directory scan
-        print("4. Testing home directory scan...")
-        result = loader.scan_documents('manual')  # Start with manual mode
-        summary = loader.get_scan_summary(result)
-        
-        print(f"   ✓ Scan completed")
-        print(f"   📊 Results:")
-        print(f"      • Documents found: {summary['total_documents']}")
-        print(f"      • Total size: {summary['total_size_formatted']}")
-        print(f"      • Files scanned: {summary['total_files_found']}")
-        print(f"      • Skipped: {summary['skipped_files']}")
-        print(f"      • Permission errors: {summary['permission_errors']}")
-        print(f"      • Scan time: {summary['scan_time']:.2f}s")
-        
+        out.append(f"   ✓ Scanner initialized (sudo: {loader.is_sudo})")
+        _flush(out)
+
+        # Test home directory scan; results are kept per mode so the
+        # mode loop below doesn't repeat an identical scan
+        out.append("4. Testing home directory scan...")
+        results = {}
+        results['manual'] = loader.scan_documents('manual')  # Start with manual mode
+        summary = loader.get_scan_summary(results['manual'])
+
+        out.append("   ✓ Scan completed")
+        out.append("   📊 Results:")
+        out.append(f"      • Documents found: {summary['total_documents']}")
+        out.append(f"      • Total size: {summary['total_size_formatted']}")
+        out.append(f"      • Files scanned: {summary['total_files_found']}")
+        out.append(f"      • Skipped: {summary['skipped_files']}")
+        out.append(f"      • Permission errors: {summary['permission_errors']}")
+        out.append(f"      • Scan time: {summary['scan_time']:.2f}s")
+        _flush(out)
+
         # Test different scan modes
         scan_modes = ['manual', 'home']
         if loader.is_sudo:
             scan_modes.append('system')
-        
-        print("\n5. Testing scan modes:")
+
+        out.append("\n5. Testing scan modes:")
         for mode in scan_modes:
             try:
-                print(f"   Testing '{mode}' mode...")
+                out.append(f"   Testing '{mode}' mode...")
                 if mode == 'system':
-                    print("   ⚠️  Skipping system scan (would scan entire filesystem)")
+                    out.append("   ⚠️  Skipping system scan (would scan entire filesystem)")
                     continue
-                
-                result = loader.scan_documents(mode)
-                summary = loader.get_scan_summary(result)
-                print(f"   ✓ {mode}: {summary['total_documents']} docs, {summary['total_size_formatted']}")
-                
+
+                if mode not in results:
+                    results[mode] = loader.scan_documents(mode)
+                summary = loader.get_scan_summary(results[mode])
+                out.append(f"   ✓ {mode}: {summary['total_documents']} docs, {summary['total_size_formatted']}")
+
             except Exception as e:
-                print(f"   ✗ {mode}: {e}")
-        
-        print("\n🎉 System Test Complete!")
-        print("=" * 60)
-        print("✅ Local RAG Assistant is ready for system-wide document scanning")
-        print("\nNext steps:")
-        print("• For manual scanning: make ingest")
-        print("• For home scanning: make ingest-home") 
-        print("• For system scanning: sudo make ingest-system")
-        print("• Install LLM support: python scripts/install_llama_cpp.py")
-        
+                out.append(f"   ✗ {mode}: {e}")
+        _flush(out)
+
+        out.append("\n🎉 System Test Complete!")
+        out.append("=" * 60)
+        out.append("✅ Local RAG Assistant is ready for system-wide document scanning")
+        out.append("\nNext steps:")
+        out.append("• For manual scanning: make ingest")
+        out.append("• For home scanning: make ingest-home")
+        out.append("• For system scanning: sudo make ingest-system")
+        out.append("• Install LLM support: python scripts/install_llama_cpp.py")
+        _flush(out)
+
         return True
-        
+
     except Exception as e:
+        # Show whatever the failing section had buffered before the error
+        _flush(out)
         print(f"\n❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        if logger is not None:
+            # Route the traceback through the queued logging path, then
+            # stop the listener so the buffered output drains
+            logger.exception("System test failed")
+            listener = getattr(logger, '_listener', None)
+            if listener is not None:
+                listener.stop()
+                logger._listener = None
+        else:
+            # Failure before logging was configured
+            import traceback
+            traceback.print_exc()
         return False
 
 